@@ -1,16 +1,40 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import HTMLResponse
-import os
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+from app.core.config import settings
+from app.core.cache import response_cache
+from app.core.logger import logger
+from app.core.middleware import make_etag
+from app.db.models import UserPreferences
 
-# Try to import our modules with fallbacks
-try:
-    from app.db.models import DayPlan, UserPreferences
-    from app.weather.weather_api import WeatherAPI
-    from app.weather.weather_station import WeatherStation
-    from app.planner.day_planner import DayPlanner
-    from app.core.logger import logger
+# Namespace for cached plan/preferences responses, cleared on every write
+CACHE_NAMESPACE = "sdp"
+
+# Bounds concurrent weather updates so bursts can't pile up work
+_WEATHER_SEM: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+def _weather_sem() -> asyncio.Semaphore:
+    """Weather update semaphore, recreated for each event loop"""
+    global _WEATHER_SEM
+    loop = asyncio.get_running_loop()
+    if _WEATHER_SEM is None or _WEATHER_SEM[0] is not loop:
+        _WEATHER_SEM = (loop, asyncio.Semaphore(settings.WEATHER_CONCURRENCY))
+    return _WEATHER_SEM[1]
+
+@lru_cache(maxsize=1)
+def _services():
+    """Create the weather and planner services on first use, or None if their modules are missing"""
+    try:
+        from app.weather.weather_api import WeatherAPI
+        from app.weather.weather_station import WeatherStation
+        from app.planner.day_planner import DayPlanner
+    except ImportError as e:
+        logger.warning(f"Some modules not available: {e}")
+        return None
     
-    # Initialize services
     weather_api = WeatherAPI()
     weather_station = WeatherStation()
     day_planner = DayPlanner()
@@ -18,33 +42,45 @@ try:
     # Attach day planner to weather station
     weather_station.attach(day_planner)
     
-    MODULES_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Some modules not available: {e}")
-    MODULES_AVAILABLE = False
+    return weather_api, weather_station, day_planner
 
 router = APIRouter()
 
+# Frontend page is static, so read it once instead of on every request (also served by main's "/")
+try:
+    with open("app/frontend/templates/index.html", "rb") as f:
+        INDEX_HTML = f.read()
+except FileNotFoundError:
+    INDEX_HTML = b"<h1>Smart Day Planner</h1><p>Welcome to Smart Day Planner API. Use /docs for API documentation.</p>"
+INDEX_ETAG = make_etag(INDEX_HTML)
+
 @router.get("/plan/current")
+@response_cache.cached(expire=10, namespace=CACHE_NAMESPACE)
 async def get_current_plan():
     """Get the current activity plan"""
-    if not MODULES_AVAILABLE:
+    services = _services()
+    if services is None:
         return {"error": "Day planner module not available"}
     
-    plan = await day_planner.get_current_plan()
+    _, _, day_planner = services
+    plan = day_planner.get_current_plan()
     if not plan:
         raise HTTPException(status_code=404, detail="No plan available. Please update weather first.")
     return plan
 
-@router.post("/weather/update")
-async def update_weather(background_tasks: BackgroundTasks, city: str = "Berlin"):
-    """Force a weather update"""
-    if not MODULES_AVAILABLE:
-        return {"error": "Weather module not available"}
+async def _do_update(city: str) -> dict:
+    """Fetch weather for a city and publish it, rejecting the update if too many are running"""
+    semaphore = _weather_sem()
+    try:
+        async with asyncio.timeout(settings.WEATHER_QUEUE_TIMEOUT):
+            await semaphore.acquire()
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail="Too many weather updates in progress")
     
+    # No await before the try, so a cancellation can't land between acquiring and releasing
     try:
-        weather_data = await weather_api.get_weather_data(city)
-        condition = weather_api.map_weather_condition(weather_data)
+        weather_api, weather_station, _ = _services()
+        weather_data, condition = await weather_api.get_cached_weather(city)
         
         processed_data = {
             "condition": condition,
@@ -55,24 +91,41 @@ async def update_weather(background_tasks: BackgroundTasks, city: str = "Berlin"
         }
         
         await weather_station.set_weather(processed_data, city)
+        response_cache.clear(CACHE_NAMESPACE)
+        return processed_data
+    finally:
+        semaphore.release()
+
+@router.post("/weather/update")
+async def update_weather(city: str = "Berlin"):
+    """Force a weather update"""
+    if _services() is None:
+        return {"error": "Weather module not available"}
+    
+    try:
+        processed_data = await _do_update(city)
         
         return {
             "message": f"Weather updated for {city}",
             "weather": processed_data
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating weather: {e}")
         raise HTTPException(status_code=500, detail="Failed to update weather")
 
 @router.get("/plan/history")
+@response_cache.cached(expire=60, namespace=CACHE_NAMESPACE)
 async def get_plan_history(date: str = None, location: str = "Berlin"):
     """Get historical plans"""
-    if not MODULES_AVAILABLE:
+    services = _services()
+    if services is None:
         return {"error": "Database module not available"}
     
+    _, _, day_planner = services
     try:
         if not date:
-            from datetime import datetime
             date = datetime.now().strftime("%Y-%m-%d")
             
         plan = await day_planner.get_plan_from_db(date, location)
@@ -84,33 +137,33 @@ async def get_plan_history(date: str = None, location: str = "Berlin"):
         raise HTTPException(status_code=500, detail="Failed to fetch plan history")
 
 @router.post("/preferences")
-async def update_preferences(preferences: dict):
+async def update_preferences(preferences: UserPreferences):
     """Update user preferences"""
-    if not MODULES_AVAILABLE:
+    services = _services()
+    if services is None:
         return {"error": "Day planner module not available"}
     
+    _, _, day_planner = services
     try:
-        from app.db.models import UserPreferences
-        user_prefs = UserPreferences(**preferences)
-        await day_planner.set_user_preferences(user_prefs)
+        day_planner.set_user_preferences(preferences)
+        response_cache.clear(CACHE_NAMESPACE)
         return {"message": "Preferences updated successfully"}
     except Exception as e:
         logger.error(f"Error updating preferences: {e}")
         raise HTTPException(status_code=500, detail="Failed to update preferences")
 
 @router.get("/preferences")
+@response_cache.cached(expire=30, namespace=CACHE_NAMESPACE)
 async def get_preferences():
     """Get current user preferences"""
-    if not MODULES_AVAILABLE:
+    services = _services()
+    if services is None:
         return {"error": "Day planner module not available"}
     
+    _, _, day_planner = services
     return day_planner.user_preferences
 
 @router.get("/")
 async def read_root():
     """Serve the frontend"""
-    try:
-        with open("app/frontend/templates/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Smart Day Planner</h1><p>Welcome to Smart Day Planner API. Use /docs for API documentation.</p>")
\ No newline at end of file
+    return HTMLResponse(content=INDEX_HTML, headers={"ETag": INDEX_ETAG})
\ No newline at end of file
@@ -0,0 +1,135 @@
+import time
+import asyncio
+import functools
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire `ttl` seconds after they were stored"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), least recently used first
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value for key, or default if it is missing or expired"""
+        entry = self._entries.pop(key, None)
+        if entry is None or time.monotonic() >= entry[0]:
+            return default
+        # Re-insert to mark it as most recently used
+        self._entries[key] = entry
+        return entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        if self._entries.pop(key, None) is None and len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default if it is missing or expired"""
+        entry = self._entries.pop(key, None)
+        if entry is None or time.monotonic() >= entry[0]:
+            return default
+        return entry[1]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache:
+    """In-process cache for route handler results, grouped into namespaces"""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        # (namespace, handler, arguments) -> (expires_at, result)
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        # Keys currently being computed -> future the other callers wait on
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    def cached(self, expire: int, namespace: str = "default"):
+        """
+        Cache a route handler's result for `expire` seconds per set of arguments
+
+        Expired results are kept around and served instead of a server error
+        so a failing backend does not take the endpoint down with it.
+        Concurrent calls that miss the cache for the same arguments share a
+        single handler call.
+        """
+        def decorator(func: Callable):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = (namespace, func.__qualname__, args, tuple(sorted(kwargs.items())))
+                entry = self._entries.get(key)
+                if entry and time.monotonic() < entry[0]:
+                    return entry[1]
+
+                # Concurrent misses for the same key wait for one call instead of stampeding
+                pending = self._inflight.get(key)
+                if pending is not None:
+                    try:
+                        return await asyncio.shield(pending)
+                    except asyncio.CancelledError:
+                        if not pending.cancelled():
+                            raise
+                        # The call we were waiting on was cancelled, so make our own
+
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                try:
+                    result = await self._load(func, args, kwargs, key, entry, expire)
+                except Exception as e:
+                    future.set_exception(e)
+                    # Waiters re-raise it themselves; don't warn when there are none
+                    future.exception()
+                    raise
+                else:
+                    future.set_result(result)
+                    return result
+                finally:
+                    if self._inflight.get(key) is future:
+                        del self._inflight[key]
+                    if not future.done():
+                        future.cancel()
+            return wrapper
+        return decorator
+
+    async def _load(self, func: Callable, args: Tuple, kwargs: Dict, key: Tuple,
+                    entry: Optional[Tuple[float, Any]], expire: int) -> Any:
+        """Call the handler and cache its result, falling back to a stale entry on errors"""
+        try:
+            result = await func(*args, **kwargs)
+        except HTTPException as e:
+            if entry and e.status_code >= 500:
+                return entry[1]
+            raise
+        except Exception:
+            if entry:
+                return entry[1]
+            raise
+
+        self._store(key, (time.monotonic() + expire, result))
+        return result
+
+    def _store(self, key: Tuple, entry: Tuple[float, Any]):
+        """Store an entry, evicting the oldest one when full"""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = entry
+
+    def clear(self, namespace: Optional[str] = None):
+        """Invalidate cached results, optionally only for one namespace"""
+        if namespace is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == namespace]:
+            del self._entries[key]
+
+
+response_cache = ResponseCache()
@@ -3,10 +3,24 @@ import os
 class Settings:
     APP_NAME: str = "Smart Day Planner"
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO").upper()
+    
+    # Server (plans, preferences and the scheduler live in process memory,
+    # so each extra worker keeps its own copy of them)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
     
     # MongoDB
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://mongo:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "day_planner")
+    # Pool sized for bursts of plan saves; warm connections are kept for 5 minutes
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+    MONGODB_TIMEOUT_MS: int = int(os.getenv("MONGODB_TIMEOUT_MS", "3000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    
+    # JSON file used when MongoDB is not available
+    FALLBACK_STORAGE_PATH: str = os.getenv("FALLBACK_STORAGE_PATH", "fallback_storage.json")
     
     # Weather API
     OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "demo_key_12345")
@@ -17,5 +31,12 @@ class Settings:
     
     # Scheduling
     WEATHER_UPDATE_INTERVAL: int = int(os.getenv("WEATHER_UPDATE_INTERVAL", "1800"))
+    
+    # Weather cache (seconds a fetched city stays fresh)
+    WEATHER_CACHE_TTL: int = int(os.getenv("WEATHER_CACHE_TTL", str(WEATHER_UPDATE_INTERVAL // 2)))
+    
+    # Concurrent weather updates and how long (seconds) extra requests wait for a slot
+    WEATHER_CONCURRENCY: int = int(os.getenv("WEATHER_CONCURRENCY", "4"))
+    WEATHER_QUEUE_TIMEOUT: float = float(os.getenv("WEATHER_QUEUE_TIMEOUT", "5"))
 
 settings = Settings()
\ No newline at end of file
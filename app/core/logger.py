@@ -1,10 +1,18 @@
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from app.core.config import settings
+
+_listener: Optional[QueueListener] = None
 
 def setup_logger():
+    global _listener
     logger = logging.getLogger("day_planner")
-    logger.setLevel(logging.INFO)
+    logger.setLevel(settings.LOG_LEVEL)
     
     # Create formatter
     formatter = logging.Formatter(
@@ -15,13 +23,25 @@ def setup_logger():
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
     
     # File handler
     file_handler = logging.FileHandler('day_planner.log')
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    # Handlers do blocking writes, so they run on a listener thread fed by a queue
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logger)
     
     return logger
 
+def stop_logger():
+    """Stop the background log writer after it has written queued records"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 logger = setup_logger()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import hashlib
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """Add ETag/Cache-Control headers to GET responses and answer revalidation with 304"""
+
+    def __init__(self, app, cache_control: str = "no-cache"):
+        super().__init__(app)
+        # "no-cache" lets clients store responses but revalidate before each use
+        self.cache_control = cache_control
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method != "GET" or response.status_code != 200:
+            return response
+
+        etag = response.headers.get("etag")
+        if etag is None:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = make_etag(body)
+            buffered = Response(content=body, status_code=response.status_code)
+            buffered.raw_headers = list(response.raw_headers)
+            response = buffered
+            response.headers["ETag"] = etag
+        response.headers.setdefault("Cache-Control", self.cache_control)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": response.headers["Cache-Control"]}
+            )
+        return response
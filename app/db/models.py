@@ -18,6 +18,9 @@ class WeatherCondition(str, Enum):
     SNOWY = "Snowy"
 
 class Activity(BaseModel):
+    # Activities are shared between plans and never changed once built
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     type: ActivityType
     priority: int = Field(ge=1, le=5)
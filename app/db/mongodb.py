@@ -1,28 +1,30 @@
 import os
 import json
+import mmap
+import time
+import operator
 import asyncio
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import logging
+from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import defaultdict
+from datetime import datetime, timezone
 
-# Simple logger if the app logger is not available
-class SimpleLogger:
-    def info(self, msg):
-        print(f"[INFO] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
-    
-    def warning(self, msg):
-        print(f"[WARN] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
-    
-    def error(self, msg):
-        print(f"[ERROR] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
-    
-    def debug(self, msg):
-        print(f"[DEBUG] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
+# orjson is optional - it (de)serializes the fallback storage several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Try to import app logger, fallback to simple logger
+# Try to import app logger, fallback to a plain stdlib logger
 try:
     from app.core.logger import logger
 except ImportError:
-    logger = SimpleLogger()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(asctime)s %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    logger = logging.getLogger("day_planner")
 
 # Try to import settings, fallback to environment variables
 try:
@@ -31,25 +33,219 @@ except ImportError:
     class SimpleSettings:
         MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://mongo:27017")
         MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "day_planner")
+        MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+        MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+        MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+        MONGODB_TIMEOUT_MS = int(os.getenv("MONGODB_TIMEOUT_MS", "3000"))
+        MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+        FALLBACK_STORAGE_PATH = os.getenv("FALLBACK_STORAGE_PATH", "fallback_storage.json")
     settings = SimpleSettings()
 
 # ==================== FALLBACK STORAGE SYSTEM ====================
 
+# (time it was formatted at, formatted UTC timestamp)
+_NOW_CACHE: Tuple[float, str] = (0.0, "")
+
+def _iso_now() -> str:
+    """Current UTC time in ISO format, reformatted at most once per second"""
+    global _NOW_CACHE
+    now = time.time()
+    cached_at, cached = _NOW_CACHE
+    if now - cached_at < 1.0:
+        return cached
+    cached = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    _NOW_CACHE = (now, cached)
+    return cached
+
+def _json_default(obj):
+    """Serialize datetimes like orjson's OPT_NAIVE_UTC for the stdlib json fallback"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Comparison operators understood by the fallback query matcher
+_OPERATORS = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$ne": operator.ne,
+}
+
+def _is_operator_query(value: Any) -> bool:
+    """Whether a query value is an operator document like {"$gte": ...}"""
+    return isinstance(value, dict) and any(key.startswith("$") for key in value)
+
+def _match_operators(field_value: Any, conditions: Dict) -> bool:
+    """Check a field value against operator conditions"""
+    for op, operand in conditions.items():
+        compare = _OPERATORS.get(op)
+        if compare is None:
+            raise ValueError(f"Unsupported query operator in fallback storage: {op}")
+        try:
+            if not compare(field_value, operand):
+                return False
+        except TypeError:
+            # Missing or differently typed fields never satisfy a comparison
+            return False
+    return True
+
+def _match(doc: Dict, items: Tuple[Tuple[str, Any], ...]) -> bool:
+    """Check a document against a query's (key, value) pairs"""
+    for key, value in items:
+        if _is_operator_query(value):
+            if not _match_operators(doc.get(key), value):
+                return False
+        elif doc.get(key) != value:
+            return False
+    return True
+
+def _project(doc: Dict, projection: Optional[Dict]) -> Dict:
+    """Copy a document keeping only the fields selected by a MongoDB-style projection"""
+    if not projection:
+        return doc.copy()
+    
+    included = [key for key, value in projection.items() if value and key != '_id']
+    if included:
+        result = {key: doc[key] for key in included if key in doc}
+        if projection.get('_id', 1) and '_id' in doc:
+            result['_id'] = doc['_id']
+        return result
+    return {key: value for key, value in doc.items() if projection.get(key, 1)}
+
+class FallbackCursor:
+    """Small stand-in for a Motor cursor over fallback storage results"""
+    
+    def __init__(self, documents: List[Dict]):
+        self._documents = documents
+        self._limit = 0
+    
+    def sort(self, key, direction: int = 1) -> "FallbackCursor":
+        """Sort by a field, or by a list of (field, direction) pairs"""
+        keys = [(key, direction)] if isinstance(key, str) else list(key)
+        # Stable sorts applied from the last key to the first give a multi-key sort
+        for field, field_direction in reversed(keys):
+            self._documents.sort(
+                key=lambda doc: (doc.get(field) is not None, doc.get(field)),
+                reverse=field_direction < 0
+            )
+        return self
+    
+    def limit(self, limit: int) -> "FallbackCursor":
+        """Return at most limit documents (0 means no limit)"""
+        self._limit = limit
+        return self
+    
+    def _results(self) -> List[Dict]:
+        return self._documents[:self._limit] if self._limit else self._documents
+    
+    async def to_list(self, length: Optional[int] = None) -> List[Dict]:
+        """All results as a list, at most length of them"""
+        results = self._results()
+        return results if length is None else results[:length]
+    
+    def __await__(self):
+        # Awaiting the cursor directly gives the result list
+        return self.to_list().__await__()
+    
+    def __aiter__(self):
+        return self._iterate()
+    
+    async def _iterate(self):
+        for doc in self._results():
+            yield doc
+
 class FallbackCollection:
+    # Fields with a secondary index besides _id from the start; others are indexed
+    # the first time an equality query uses them
+    INDEXED_FIELDS = ("user_id", "date", "location")
+    
     def __init__(self, data: List[Dict], save_callback):
         self.data = data
         self.save_callback = save_callback
+        self._indexed_fields: List[str] = list(self.INDEXED_FIELDS)
+        self._by_id: Dict[Any, int] = {}
+        self._by_field: Dict[Tuple[str, Any], Set[int]] = defaultdict(set)
+        for position in range(len(self.data)):
+            self._index(position)
+    
+    def _add_index(self, field: str):
+        """Start indexing field, covering the documents already stored"""
+        self._indexed_fields.append(field)
+        for position, doc in enumerate(self.data):
+            if field in doc:
+                try:
+                    self._by_field[(field, doc[field])].add(position)
+                except TypeError:
+                    pass
+    
+    def _index(self, position: int):
+        """Add the document at position to the indexes"""
+        doc = self.data[position]
+        try:
+            if '_id' in doc:
+                self._by_id.setdefault(doc['_id'], position)
+        except TypeError:
+            pass
+        for field in self._indexed_fields:
+            if field in doc:
+                try:
+                    self._by_field[(field, doc[field])].add(position)
+                except TypeError:
+                    pass
+    
+    def _unindex(self, position: int):
+        """Remove the document at position from the indexes"""
+        doc = self.data[position]
+        try:
+            if self._by_id.get(doc.get('_id')) == position:
+                del self._by_id[doc['_id']]
+        except TypeError:
+            pass
+        for field in self._indexed_fields:
+            if field in doc:
+                try:
+                    self._by_field[(field, doc[field])].discard(position)
+                except TypeError:
+                    pass
     
-    async def find_one(self, query: Dict) -> Optional[Dict]:
+    def _candidates(self, query: Dict) -> Optional[List[int]]:
+        """Positions that may match the query, or None when no index applies"""
+        try:
+            if '_id' in query:
+                position = self._by_id.get(query['_id'])
+                return [] if position is None else [position]
+            
+            candidates = None
+            for field, value in query.items():
+                if value is None or _is_operator_query(value):
+                    continue
+                hash(value)  # Unhashable values can't use (or create) an index
+                if field not in self._indexed_fields:
+                    self._add_index(field)
+                positions = self._by_field.get((field, value), set())
+                candidates = positions if candidates is None else candidates & positions
+            return None if candidates is None else sorted(candidates)
+        except TypeError:
+            # Unhashable query values (e.g. operators) can't use the indexes
+            return None
+    
+    def _matches(self, query: Dict):
+        """Yield (position, document) pairs matching query, in insertion order"""
+        items = tuple(query.items())
+        candidates = self._candidates(query)
+        positions = range(len(self.data)) if candidates is None else candidates
+        for position in positions:
+            doc = self.data[position]
+            if _match(doc, items):
+                yield position, doc
+    
+    async def find_one(self, query: Dict, projection: Optional[Dict] = None) -> Optional[Dict]:
         """Find one document matching query"""
-        for doc in self.data:
-            match = True
-            for key, value in query.items():
-                if doc.get(key) != value:
-                    match = False
-                    break
-            if match:
-                return doc.copy()  # Return copy to avoid modifying original
+        for _, doc in self._matches(query):
+            return _project(doc, projection)  # Return copy to avoid modifying original
         return None
     
     async def insert_one(self, document: Dict) -> None:
@@ -58,34 +254,45 @@ class FallbackCollection:
         if '_id' not in document:
             document['_id'] = f"doc_{len(self.data) + 1}_{datetime.now().timestamp()}"
         self.data.append(document)
+        self._index(len(self.data) - 1)
         self.save_callback()
         logger.debug(f"Inserted document with _id: {document['_id']}")
     
+    async def insert_many(self, documents: List[Dict]) -> None:
+        """Insert several documents with a single save"""
+        start = len(self.data)
+        timestamp = datetime.now().timestamp()
+        for offset, document in enumerate(documents, start + 1):
+            document = document.copy()  # Work with copy
+            if '_id' not in document:
+                document['_id'] = f"doc_{offset}_{timestamp}"
+            self.data.append(document)
+            self._index(len(self.data) - 1)
+        self.save_callback()
+        logger.debug(f"Inserted {len(self.data) - start} documents")
+    
     async def update_one(self, query: Dict, update: Dict, upsert: bool = False) -> None:
         """Update one document matching query"""
         found = False
-        for i, doc in enumerate(self.data):
-            match = True
-            for key, value in query.items():
-                if doc.get(key) != value:
-                    match = False
-                    break
-            if match:
-                found = True
-                # Handle $set operator or direct update
-                if '$set' in update:
-                    self.data[i].update(update['$set'])
-                else:
-                    self.data[i].update(update)
-                self.data[i]['updated_at'] = datetime.utcnow().isoformat()
-                logger.debug(f"Updated document: {query}")
-                break
+        for i, _ in self._matches(query):
+            found = True
+            self._unindex(i)
+            # Handle $set operator or direct update ($setOnInsert only applies to upserts)
+            if '$set' in update or '$setOnInsert' in update:
+                self.data[i].update(update.get('$set', {}))
+            else:
+                self.data[i].update(update)
+            self.data[i]['updated_at'] = _iso_now()
+            self._index(i)
+            logger.debug(f"Updated document: {query}")
+            break
         
         if not found and upsert:
             # Create new document for upsert
             new_doc = query.copy()
-            if '$set' in update:
-                new_doc.update(update['$set'])
+            if '$set' in update or '$setOnInsert' in update:
+                new_doc.update(update.get('$setOnInsert', {}))
+                new_doc.update(update.get('$set', {}))
             else:
                 new_doc.update(update)
             await self.insert_one(new_doc)
@@ -94,74 +301,159 @@ class FallbackCollection:
         if found or (not found and upsert):
             self.save_callback()
     
-    async def find(self, query: Dict = None) -> List[Dict]:
-        """Find all documents matching query"""
+    async def replace_one(self, query: Dict, replacement: Dict, upsert: bool = False) -> None:
+        """Replace one document matching query, keeping its _id"""
+        for i, doc in self._matches(query):
+            self._unindex(i)
+            new_doc = replacement.copy()
+            new_doc['_id'] = doc['_id']
+            self.data[i] = new_doc
+            self._index(i)
+            self.save_callback()
+            logger.debug(f"Replaced document: {query}")
+            return
+        
+        if upsert:
+            new_doc = replacement.copy()
+            if '_id' not in new_doc and '_id' in query:
+                new_doc['_id'] = query['_id']
+            await self.insert_one(new_doc)
+            logger.debug(f"Upserted new document: {query}")
+    
+    def find(self, query: Dict = None, projection: Optional[Dict] = None) -> FallbackCursor:
+        """Find all documents matching query; the cursor can be sorted, limited or awaited"""
         if query is None:
-            return self.data.copy()
+            return FallbackCursor([_project(doc, projection) for doc in self.data])
         
-        results = []
-        for doc in self.data:
-            match = True
-            for key, value in query.items():
-                if doc.get(key) != value:
-                    match = False
-                    break
-            if match:
-                results.append(doc.copy())
-        return results
+        return FallbackCursor([_project(doc, projection) for _, doc in self._matches(query)])
 
 class FallbackStorage:
-    def __init__(self):
+    def __init__(self, file_path: Optional[str] = None):
         self.data = {}
-        self.file_path = "fallback_storage.json"
+        self.file_path = file_path or settings.FALLBACK_STORAGE_PATH
+        self._collections: Dict[str, FallbackCollection] = {}
+        self._dirty = False
+        self._flusher: Optional[asyncio.Task] = None
+        # Serializes flushes; recreated for each event loop like the scheduler's health lock
+        self._flush_lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
         self._load_data()
     
     def _load_data(self):
         """Load data from JSON file"""
         try:
-            if os.path.exists(self.file_path):
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
+            # mmap can't map an empty file, and there is nothing to load from one
+            if os.path.exists(self.file_path) and os.path.getsize(self.file_path):
+                with open(self.file_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if orjson:
+                        # Parse straight from the mapped pages without copying the file
+                        with memoryview(mm) as view:
+                            self.data = orjson.loads(view)
+                    else:
+                        self.data = json.loads(mm.read())
                 logger.info(f"Loaded data from fallback storage: {self.file_path}")
                 logger.info(f"Collections: {list(self.data.keys())}")
         except Exception as e:
             logger.warning(f"Could not load fallback storage: {e}")
             self.data = {}
     
-    def _save_data(self):
-        """Save data to JSON file"""
+    def _mark_dirty(self):
+        """Mark data as changed so the next flush writes it"""
+        self._dirty = True
+    
+    def _serialize(self) -> Optional[bytes]:
+        """Serialize data for writing, or None if it can't be serialized"""
+        try:
+            if orjson:
+                return orjson.dumps(self.data, option=orjson.OPT_NAIVE_UTC)
+            return json.dumps(
+                self.data, separators=(',', ':'), ensure_ascii=False, default=_json_default
+            ).encode('utf-8')
+        except Exception as e:
+            logger.error(f"Could not serialize fallback storage: {e}")
+            return None
+    
+    def _write(self, payload: bytes) -> bool:
+        """Write serialized data to JSON file, returning whether it was written"""
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            with open(self.file_path, 'wb') as f:
+                f.write(payload)
             logger.debug("Saved data to fallback storage")
+            return True
         except Exception as e:
             logger.error(f"Could not save fallback storage: {e}")
+            return False
+    
+    def _lock(self) -> asyncio.Lock:
+        """Flush lock for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._flush_lock[0] is not loop:
+            self._flush_lock = (loop, asyncio.Lock())
+        return self._flush_lock[1]
+    
+    async def flush(self):
+        """Write pending changes to JSON file without blocking the event loop"""
+        async with self._lock():
+            if not self._dirty:
+                return
+            self._dirty = False
+            # Serialize on the loop so the data can't change mid-dump, write in a thread
+            payload = self._serialize()
+            written = payload is not None and await asyncio.to_thread(self._write, payload)
+            if not written:
+                # Keep the changes pending so the next flush retries them
+                self._dirty = True
+    
+    async def _flush_loop(self, interval: float):
+        """Periodically flush pending changes"""
+        while True:
+            await asyncio.sleep(interval)
+            # Shielded so cancelling the loop can't abandon a write halfway; stop_flusher waits for it
+            await asyncio.shield(self.flush())
+    
+    def start_flusher(self, interval: float = 1.0):
+        """Start the background flush task"""
+        if (self._flusher is None or self._flusher.done()
+                or self._flusher.get_loop() is not asyncio.get_running_loop()):
+            self._flusher = asyncio.create_task(self._flush_loop(interval))
+    
+    async def stop_flusher(self):
+        """Stop the background flush task and write any pending changes (after an in-flight write)"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            if self._flusher.get_loop() is asyncio.get_running_loop():
+                try:
+                    await self._flusher
+                except asyncio.CancelledError:
+                    pass
+            self._flusher = None
+        await self.flush()
     
     def get_collection(self, collection_name: str) -> FallbackCollection:
         """Get or create a collection"""
-        if collection_name not in self.data:
-            self.data[collection_name] = []
-            logger.debug(f"Created new collection: {collection_name}")
-        return FallbackCollection(self.data[collection_name], self._save_data)
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            if collection_name not in self.data:
+                self.data[collection_name] = []
+                logger.debug(f"Created new collection: {collection_name}")
+            # Keep the instance so its indexes are built only once
+            collection = FallbackCollection(self.data[collection_name], self._mark_dirty)
+            self._collections[collection_name] = collection
+        return collection
 
 # ==================== MONGODB CONNECTION ====================
 
-# Initialize variables - COMPLETELY REMOVE MOTOR IMPORTS
-MONGODB_AVAILABLE = False
 fallback_storage = FallbackStorage()
 
-# Check if motor is available without importing it
-def check_motor_available():
-    """Check if motor package is available without importing it"""
-    try:
-        import importlib.util
-        spec = importlib.util.find_spec("motor.motor_asyncio")
-        return spec is not None
-    except:
-        return False
-
-# Set MongoDB availability
-MONGODB_AVAILABLE = check_motor_available()
+# Motor is optional - without it everything goes to fallback storage
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ReplaceOne
+    MONGODB_AVAILABLE = True
+except ImportError:
+    AsyncIOMotorClient = None
+    ReplaceOne = None
+    MONGODB_AVAILABLE = False
 
 if MONGODB_AVAILABLE:
     logger.info("Motor package is available - MongoDB can be used")
@@ -181,78 +473,129 @@ async def connect_to_mongo():
     """Connect to MongoDB or setup fallback storage"""
     if not MONGODB_AVAILABLE:
         logger.info("Using fallback storage system (no MongoDB needed)")
-        logger.info("Data will be stored in: fallback_storage.json")
+        logger.info(f"Data will be stored in: {fallback_storage.file_path}")
+        fallback_storage.start_flusher()
+        return
+    
+    if mongodb.database is not None:
+        # Already connected: keep the existing client and its connection pool
         return
     
     try:
-        # Import motor only if available - USE DYNAMIC IMPORT
-        motor_spec = __import__('importlib.util').util.find_spec("motor.motor_asyncio")
-        if motor_spec is not None:
-            motor_module = __import__('motor.motor_asyncio', fromlist=['AsyncIOMotorClient'])
-            AsyncIOMotorClient = getattr(motor_module, 'AsyncIOMotorClient')
-            
-            logger.info(f"Connecting to MongoDB: {settings.MONGODB_URL}")
-            mongodb.client = AsyncIOMotorClient(settings.MONGODB_URL)
-            mongodb.database = mongodb.client[settings.MONGODB_DB_NAME]
-            
-            # Test connection with a simple command
-            await mongodb.database.command('ping')
-            logger.info("Successfully connected to MongoDB")
-            logger.info(f"Database: {settings.MONGODB_DB_NAME}")
-        else:
-            raise ImportError("Motor package not found")
+        logger.info(f"Connecting to MongoDB: {settings.MONGODB_URL}")
+        mongodb.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGODB_TIMEOUT_MS,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            retryWrites=True
+        )
+        database = mongodb.client[settings.MONGODB_DB_NAME]
+        
+        # Test connection with a simple command (also warms up the pool)
+        await database.command('ping')
+        mongodb.database = database
+        # A reconnect after an earlier failure goes back to MongoDB
+        mongodb.use_fallback = False
+        logger.info("Successfully connected to MongoDB")
+        logger.info(f"Database: {settings.MONGODB_DB_NAME}")
+        await create_indexes()
         
-    except ImportError:
-        logger.error("Motor package not installed")
-        logger.info("Switching to fallback storage system")
-        mongodb.use_fallback = True
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         logger.info("Switching to fallback storage system")
+        if mongodb.client is not None:
+            mongodb.client.close()
+            mongodb.client = None
         mongodb.use_fallback = True
+        fallback_storage.start_flusher()
+
+async def create_indexes():
+    """Create the indexes used by plan and preferences lookups (idempotent)"""
+    if mongodb.use_fallback or mongodb.database is None:
+        return
+    
+    try:
+        plans = mongodb.database["plans"]
+        # One plan per user, date and location; its (user_id, date) prefix also serves
+        # per-user date-range queries in either sort direction
+        await plans.create_index(
+            [("user_id", 1), ("date", 1), ("location", 1)],
+            unique=True,
+            name="plan_key"
+        )
+        await plans.create_index("location")
+        await mongodb.database["user_preferences"].create_index("user_id", unique=True)
+        logger.info("MongoDB indexes ensured")
+    except Exception as e:
+        logger.warning(f"Could not create MongoDB indexes: {e}")
 
 async def close_mongo_connection():
-    """Close MongoDB connection if active"""
+    """Close MongoDB connection if active and flush fallback storage"""
+    await fallback_storage.stop_flusher()
     if mongodb.client and MONGODB_AVAILABLE and not mongodb.use_fallback:
         mongodb.client.close()
+        mongodb.client = None
+        mongodb.database = None
         logger.info("🔌 Closed MongoDB connection")
 
+def using_fallback() -> bool:
+    """Whether data goes to fallback storage (no MongoDB, or not connected yet)"""
+    return mongodb.use_fallback or not MONGODB_AVAILABLE or mongodb.database is None
+
 def get_database():
     """Get database instance or fallback storage"""
-    if mongodb.use_fallback or not MONGODB_AVAILABLE:
+    if using_fallback():
         return fallback_storage
     return mongodb.database
 
+# collection name -> (database it belongs to, collection handle)
+_collection_cache: Dict[str, Tuple[Any, Any]] = {}
+
 def get_collection(collection_name: str):
-    """Get collection from MongoDB or fallback storage"""
+    """Get collection from MongoDB or fallback storage, reusing handles per database"""
     database = get_database()
     
     if database is None:
         logger.error("Database not available")
         return None
     
-    if mongodb.use_fallback or not MONGODB_AVAILABLE:
+    cached = _collection_cache.get(collection_name)
+    if cached is not None and cached[0] is database:
+        return cached[1]
+    
+    if using_fallback():
         logger.debug(f"Using fallback collection: {collection_name}")
-        return database.get_collection(collection_name)
+        collection = database.get_collection(collection_name)
     else:
         logger.debug(f"Using MongoDB collection: {collection_name}")
-        # For MongoDB, we need to handle the collection differently
-        try:
-            # Dynamic import for MongoDB collection
-            if hasattr(database, '__getitem__'):
-                return database[collection_name]
-            else:
-                logger.error("MongoDB database doesn't support collection access")
-                return database.get_collection(collection_name)
-        except Exception as e:
-            logger.error(f"Failed to get MongoDB collection: {e}")
-            return database.get_collection(collection_name)
+        collection = database[collection_name]
+    
+    _collection_cache[collection_name] = (database, collection)
+    return collection
+
+async def bulk_replace(collection, replacements: List[Tuple[Dict, Dict]]) -> None:
+    """Upsert many (filter, document) pairs, in a single round-trip on MongoDB"""
+    if not replacements:
+        return
+    if isinstance(collection, FallbackCollection):
+        for query, document in replacements:
+            await collection.replace_one(query, document, upsert=True)
+        return
+    # Unordered so the server doesn't have to apply the writes one after another
+    await collection.bulk_write(
+        [ReplaceOne(query, document, upsert=True) for query, document in replacements],
+        ordered=False
+    )
 
 def get_storage_info() -> Dict[str, Any]:
     """Get information about current storage system"""
     return {
         "mongodb_available": MONGODB_AVAILABLE,
-        "using_fallback": mongodb.use_fallback or not MONGODB_AVAILABLE,
+        "using_fallback": using_fallback(),
         "fallback_file": fallback_storage.file_path if not MONGODB_AVAILABLE else None,
         "collections": list(fallback_storage.data.keys()) if not MONGODB_AVAILABLE else []
     }
@@ -267,20 +610,21 @@ async def save_plan(plan_data: Dict) -> bool:
             logger.error("No collection available for saving plan")
             return False
         
-        # Generate unique ID if not present
-        if '_id' not in plan_data:
-            plan_data['_id'] = f"plan_{plan_data.get('date', 'unknown')}_{plan_data.get('location', 'unknown')}_{plan_data.get('user_id', 'default')}"
-        
-        plan_data['updated_at'] = datetime.utcnow().isoformat()
+        # Plans are matched by (user_id, date, location) like DayPlanner's saves, which
+        # the unique plan_key index enforces; the readable _id is only set on insert
+        query = {
+            "user_id": plan_data.get('user_id', 'default'),
+            "date": plan_data.get('date', 'unknown'),
+            "location": plan_data.get('location', 'unknown')
+        }
+        plan_id = plan_data.get('_id') or f"plan_{query['date']}_{query['location']}_{query['user_id']}"
+        document = {key: value for key, value in plan_data.items() if key != '_id'}
+        document['updated_at'] = _iso_now()
         
         # Use upsert to update existing or insert new
-        await collection.update_one(
-            {"_id": plan_data['_id']},
-            {"$set": plan_data},
-            upsert=True
-        )
+        await collection.update_one(query, {"$set": document, "$setOnInsert": {"_id": plan_id}}, upsert=True)
         
-        logger.debug(f"Plan saved: {plan_data['_id']}")
+        logger.debug(f"Plan saved: {plan_id}")
         return True
         
     except Exception as e:
@@ -311,7 +655,7 @@ async def get_user_plans(user_id: str, date: str = None) -> List[Dict]:
         if date:
             query["date"] = date
         
-        return await collection.find(query)
+        return await collection.find(query).to_list(length=None)
         
     except Exception as e:
         logger.error(f"Failed to get plans for user {user_id}: {e}")
@@ -328,7 +672,7 @@ async def save_user_preferences(user_id: str, preferences: Dict) -> bool:
             "_id": f"prefs_{user_id}",
             "user_id": user_id,
             "preferences": preferences,
-            "updated_at": datetime.utcnow().isoformat()
+            "updated_at": _iso_now()
         }
         
         await collection.update_one(
@@ -433,25 +777,6 @@ async def demo_fallback_storage():
     info = get_storage_info()
     logger.info(f"Storage info: {info}")
 
-# Initialize on import
-if __name__ != "__main__":
-    # Auto-connect when module is imported
-    async def initialize():
-        await connect_to_mongo()
-    
-    # Run the initialization
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, create task
-            loop.create_task(initialize())
-        else:
-            # If loop is not running, run until complete
-            loop.run_until_complete(initialize())
-    except:
-        # If no event loop, just log
-        logger.info("🔧 MongoDB module initialized (async connect scheduled)")
-
 # For direct testing
 if __name__ == "__main__":
     async def main():
@@ -459,6 +784,7 @@ if __name__ == "__main__":
         await connect_to_mongo()
         await test_connection()
         await demo_fallback_storage()
+        await fallback_storage.flush()
         
         # Show final status
         info = get_storage_info()
@@ -9,14 +9,24 @@ sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse
 from contextlib import asynccontextmanager
 
+# Use orjson for API responses when it is installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 # Імпортуємо наші модулі
-from app.api.routes import router
+from app.api.routes import router, INDEX_HTML, INDEX_ETAG
 from app.db.mongodb import connect_to_mongo, close_mongo_connection
-from app.tasks.scheduler import start_scheduler
+from app.tasks.scheduler import start_scheduler, stop_scheduler
+from app.planner.day_planner import wait_for_pending_saves
 from app.core.logger import logger
 from app.core.config import settings
+from app.core.middleware import ETagMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,24 +34,28 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME}")
     await connect_to_mongo()
     
-    # Start background scheduler
-    scheduler = start_scheduler()
+    # Start background scheduler inside the server's event loop
+    start_scheduler()
     
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await wait_for_pending_saves()
     await close_mongo_connection()
-    if scheduler:
-        scheduler.shutdown()
+    stop_scheduler()
 
 app = FastAPI(
     title="Smart Day Planner",
     description="A smart day planner that adapts to weather conditions",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
+# Let clients revalidate GET responses with ETags
+app.add_middleware(ETagMiddleware)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
 
@@ -51,12 +65,7 @@ app.mount("/static", StaticFiles(directory="app/frontend/static"), name="static"
 @app.get("/")
 async def read_root():
     """Serve the frontend"""
-    from fastapi.responses import HTMLResponse
-    try:
-        with open("app/frontend/templates/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Smart Day Planner</h1><p>Frontend template not found</p>")
+    return HTMLResponse(content=INDEX_HTML, headers={"ETag": INDEX_ETAG})
 
 @app.get("/health")
 async def health_check():
@@ -64,4 +73,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # "auto" picks uvloop/httptools when installed; workers need an import string
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=settings.WEB_CONCURRENCY,
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        log_level=settings.LOG_LEVEL.lower()
+    )
\ No newline at end of file
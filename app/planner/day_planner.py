@@ -1,15 +1,168 @@
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict, Any
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Set, Tuple
 from app.weather.weather_station import Observer, WeatherCondition
+from app.weather.weather_api import WeatherAPI
 from app.planner.strategies.base import WeatherStrategy
 from app.planner.strategies.sunny import SunnyWeatherStrategy
 from app.planner.strategies.rainy import RainyWeatherStrategy
 from app.planner.strategies.cloudy import CloudyWeatherStrategy
 from app.planner.strategies.snowy import SnowyWeatherStrategy
-from app.db.models import DayPlan, UserPreferences, Activity
-from app.db.mongodb import get_collection
+from app.db.models import DayPlan, UserPreferences, Activity, ActivityType
+from app.db.mongodb import get_collection, bulk_replace
 from app.core.logger import logger
+from app.core.cache import TTLCache
+
+# Strategies are stateless, so one shared instance per weather condition is enough
+_STRATEGIES: Dict[WeatherCondition, WeatherStrategy] = {
+    WeatherCondition.SUNNY: SunnyWeatherStrategy(),
+    WeatherCondition.RAINY: RainyWeatherStrategy(),
+    WeatherCondition.CLOUDY: CloudyWeatherStrategy(),
+    WeatherCondition.SNOWY: SnowyWeatherStrategy()
+}
+_DEFAULT_STRATEGY = _STRATEGIES[WeatherCondition.CLOUDY]
+
+# Shared client for forced regenerations (it also holds the weather cache)
+_WEATHER_API = WeatherAPI()
+
+# (monotonic time it was computed at, today's date as YYYY-MM-DD)
+_TODAY_CACHE = (float("-inf"), "")
+
+def _today_str() -> str:
+    """Today's local date as YYYY-MM-DD, recomputed at most once per second"""
+    global _TODAY_CACHE
+    now = time.monotonic()
+    cached_at, cached = _TODAY_CACHE
+    if now - cached_at < 1.0:
+        return cached
+    cached = date.today().isoformat()
+    _TODAY_CACHE = (now, cached)
+    return cached
+
+# How long (seconds) a plan is reused when the same weather is pushed again
+PLAN_REUSE_SECONDS = 300
+
+def _coerce_condition(value: Any) -> Optional[WeatherCondition]:
+    """Turn a condition value (enum member or its string) into a WeatherCondition, None if unknown"""
+    if isinstance(value, WeatherCondition):
+        return value
+    try:
+        return WeatherCondition(value)
+    except ValueError:
+        return None
+
+def _plan_input_key(condition: Optional[WeatherCondition], weather_data: Dict[str, Any], location: str) -> tuple:
+    """What a plan depends on: condition, location, day and whole-degree temperature"""
+    temperature = weather_data.get('temperature')
+    if isinstance(temperature, (int, float)):
+        temperature = round(temperature)
+    return (condition, location, _today_str(), temperature)
+
+# Background plan saves still running (kept referenced until they finish)
+_PENDING_SAVES: Set[asyncio.Task] = set()
+
+async def wait_for_pending_saves():
+    """Wait until all background plan saves started on the running loop have finished"""
+    loop = asyncio.get_running_loop()
+    pending = [task for task in _PENDING_SAVES if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending)
+
+class _SaveBatcher:
+    """Collects plan saves for a few milliseconds and writes them with one bulk upsert"""
+    
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.01):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, query: Dict[str, Any], document: Dict[str, Any]):
+        """Queue an upsert and wait until the batch containing it is written"""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        self._queue.put_nowait((query, document, future))
+        await future
+    
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop):
+        """Start the writer task, or restart it if it stopped or belongs to another loop"""
+        if self._worker is not None and not self._worker.done() and self._worker.get_loop() is loop:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run(self._queue))
+    
+    async def _run(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._write(batch)
+    
+    async def _write(self, batch: List[Tuple[Dict[str, Any], Dict[str, Any], asyncio.Future]]):
+        """Write a batch and resolve the futures of everyone waiting on it"""
+        # Later saves of the same plan win, like they would if written one by one
+        replacements = {tuple(sorted(query.items())): (query, document) for query, document, _ in batch}
+        try:
+            collection = get_collection("plans")
+            if collection is None:
+                raise RuntimeError("No database collection available")
+            await bulk_replace(collection, list(replacements.values()))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+_SAVE_BATCHER = _SaveBatcher()
+
+# Only the DayPlan fields are fetched when reading plans back
+_PLAN_PROJECTION: Dict[str, int] = {"_id": 0, **{field: 1 for field in DayPlan.model_fields}}
+
+def _plan_to_doc(plan: DayPlan) -> Dict[str, Any]:
+    """Build the stored document for a plan by hand (DayPlan's shape is fixed, so skip model_dump)"""
+    return {
+        "date": plan.date,
+        "location": plan.location,
+        "weather": plan.weather,
+        "user_id": plan.user_id,
+        "activities": [
+            {
+                "name": activity.name,
+                "type": activity.type.value,
+                "priority": activity.priority,
+                "description": activity.description
+            }
+            for activity in plan.activities
+        ]
+    }
+
+def _plan_from_doc(document: Dict[str, Any]) -> DayPlan:
+    """Build a DayPlan from a stored document without re-validating it (we wrote it from a DayPlan)"""
+    # model_construct skips validation, so turn the stored enum values back into members here;
+    # unknown values (generate_plan accepts any condition) are kept as the stored strings
+    activities = [
+        Activity.model_construct(**{
+            **activity, "type": ActivityType._value2member_map_.get(activity["type"], activity["type"])
+        })
+        for activity in document.get("activities", [])
+    ]
+    weather = document.get("weather", {})
+    if "condition" in weather:
+        weather = {**weather, "condition": _coerce_condition(weather["condition"]) or weather["condition"]}
+    return DayPlan.model_construct(**{**document, "weather": weather, "activities": activities})
 
 class DayPlanner(Observer):
     """
@@ -17,12 +170,29 @@ class DayPlanner(Observer):
     and Observer Pattern for weather updates
     """
     
+    __slots__ = (
+        "user_id", "current_plan", "user_preferences", "_strategy",
+        "_plan_cache", "_summary_cache",
+        "_last_input_key", "_last_input_at"
+    )
+    
     def __init__(self, user_id: str = "default"):
         self.user_id = user_id
         self.current_plan: Optional[DayPlan] = None
         self.user_preferences = UserPreferences()
         self._strategy: Optional[WeatherStrategy] = None
-        self.collection = get_collection("plans")
+        # (date, location, user_id) -> plan, filled by reads and saves
+        self._plan_cache = TTLCache(maxsize=256, ttl=60)
+        # get_plan_summary() result, reset whenever the plan or preferences change
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        # Input the current plan was generated from, and when (monotonic seconds)
+        self._last_input_key: Optional[tuple] = None
+        self._last_input_at = 0.0
+
+    @property
+    def collection(self):
+        """Plans collection of the active storage (MongoDB may connect after the planner is created)"""
+        return get_collection("plans")
 
     def set_strategy(self, strategy: WeatherStrategy):
         """Set the weather strategy using Strategy Pattern"""
@@ -40,30 +210,32 @@ class DayPlanner(Observer):
             weather_data.get('location', 'Unknown')
         )
 
-    async def generate_plan(self, weather_data: Dict[str, Any], location: str):
+    async def generate_plan(self, weather_data: Dict[str, Any], location: str, force: bool = False):
         """
         Generate a daily plan based on weather conditions using Strategy Pattern
+        
+        Repeated pushes of the same weather are skipped while the current plan is fresh, unless forced.
         """
-        condition = weather_data.get('condition')
+        condition = _coerce_condition(weather_data.get('condition'))
         
-        # Set strategy based on weather condition (Strategy Pattern)
-        if condition == WeatherCondition.SUNNY:
-            self.set_strategy(SunnyWeatherStrategy())
-        elif condition == WeatherCondition.RAINY:
-            self.set_strategy(RainyWeatherStrategy())
-        elif condition == WeatherCondition.CLOUDY:
-            self.set_strategy(CloudyWeatherStrategy())
-        elif condition == WeatherCondition.SNOWY:
-            self.set_strategy(SnowyWeatherStrategy())
-        else:
-            self.set_strategy(CloudyWeatherStrategy())
+        input_key = _plan_input_key(condition, weather_data, location)
+        now = time.monotonic()
+        if (not force and self.current_plan is not None and input_key == self._last_input_key
+                and now - self._last_input_at < PLAN_REUSE_SECONDS):
+            logger.debug(f"Weather unchanged for {location}, keeping current plan")
+            return
+        
+        # Set strategy based on weather condition (Strategy Pattern), cloudy by default
+        strategy = _STRATEGIES.get(condition, _DEFAULT_STRATEGY)
+        if strategy is not self._strategy:
+            self.set_strategy(strategy)
 
         if self._strategy:
             activities = await self._strategy.get_activities(self.user_preferences)
             
             # Create the day plan
             plan = DayPlan(
-                date=datetime.now().strftime("%Y-%m-%d"),
+                date=_today_str(),
                 location=location,
                 weather=weather_data,
                 activities=activities,
@@ -71,75 +243,68 @@ class DayPlanner(Observer):
             )
             
             self.current_plan = plan
-            await self._save_plan(plan)
+            self._summary_cache = None
+            self._last_input_key = input_key
+            self._last_input_at = now
+            # Persist in the background; the plan is usable as soon as it is built
+            task = asyncio.create_task(self._save_plan(plan))
+            _PENDING_SAVES.add(task)
+            task.add_done_callback(_PENDING_SAVES.discard)
             logger.info(f"Generated new plan with {len(activities)} activities for {location}")
 
     async def _save_plan(self, plan: DayPlan):
         """Save plan to database (MongoDB or fallback storage)"""
         try:
-            collection = get_collection("plans")
-            if collection is None:
-                logger.error("No database collection available")
-                return
-                
-            # Use model_dump() instead of deprecated dict()
-            plan_dict = plan.model_dump()
-            plan_dict['updated_at'] = datetime.utcnow()
+            plan_dict = _plan_to_doc(plan)
+            plan_dict['updated_at'] = datetime.now(timezone.utc)
             
-            # Check if we're using fallback storage
-            from app.db.mongodb import mongodb
-            if hasattr(mongodb, 'use_fallback') and mongodb.use_fallback:
-                # For fallback storage, handle upsert differently
-                existing = await collection.find_one({
-                    "date": plan.date, 
-                    "location": plan.location, 
-                    "user_id": plan.user_id
-                })
-                if existing:
-                    await collection.update_one(
-                        {"date": plan.date, "location": plan.location, "user_id": plan.user_id},
-                        {"$set": plan_dict}
-                    )
-                else:
-                    await collection.insert_one(plan_dict)
-            else:
-                # Normal MongoDB operation
-                await collection.update_one(
-                    {"date": plan.date, "location": plan.location, "user_id": plan.user_id},
-                    {"$set": plan_dict},
-                    upsert=True
-                )
-                
-            logger.debug(f"Plan saved: {plan.date} {plan.location}")
+            # Upserts from concurrent saves are written together in one bulk call,
+            # in submission order, so the latest save of a plan wins
+            await _SAVE_BATCHER.submit(
+                {"date": plan.date, "location": plan.location, "user_id": plan.user_id},
+                plan_dict
+            )
             
+            self._plan_cache[(plan.date, plan.location, plan.user_id)] = plan
+            logger.debug(f"Plan saved: {plan.date} {plan.location}")
+        
         except Exception as e:
             logger.error(f"Error saving plan: {e}")
 
-    async def get_current_plan(self) -> Optional[DayPlan]:
+    def get_current_plan(self) -> Optional[DayPlan]:
         """Get the current activity plan"""
         return self.current_plan
 
-    async def set_user_preferences(self, preferences: UserPreferences):
+    def set_user_preferences(self, preferences: UserPreferences):
         """Update user preferences"""
         self.user_preferences = preferences
+        self._summary_cache = None
+        # New preferences need a new plan even for unchanged weather
+        self._last_input_key = None
         logger.info(f"User preferences updated for user {self.user_id}")
 
     async def get_plan_from_db(self, date: str, location: str) -> Optional[DayPlan]:
         """Get plan from database by date and location"""
+        key = (date, location, self.user_id)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            return plan
+        
         try:
-            collection = get_collection("plans")
+            collection = self.collection
             if collection is None:
                 return None
                 
-            document = await collection.find_one({
-                "date": date,
-                "location": location,
-                "user_id": self.user_id
-            })
+            document = await collection.find_one(
+                {"date": date, "location": location, "user_id": self.user_id},
+                projection=_PLAN_PROJECTION
+            )
             
             if document:
                 # Convert database document to DayPlan model
-                return DayPlan(**document)
+                plan = _plan_from_doc(document)
+                self._plan_cache[key] = plan
+                return plan
             return None
         except Exception as e:
             logger.error(f"Error fetching plan from database: {e}")
@@ -148,64 +313,73 @@ class DayPlanner(Observer):
     async def get_user_plans(self, days: int = 7) -> list[DayPlan]:
         """Get recent plans for the user"""
         try:
-            collection = get_collection("plans")
+            collection = self.collection
             if collection is None:
                 return []
                 
             # Calculate date range
-            end_date = datetime.now()
-            start_date = datetime.now().replace(day=end_date.day - days)
+            end_date = _today_str()
+            start_date = (date.fromisoformat(end_date) - timedelta(days=days)).isoformat()
+            
+            cursor = collection.find(
+                {
+                    "user_id": self.user_id,
+                    "date": {
+                        "$gte": start_date,
+                        "$lte": end_date
+                    }
+                },
+                projection=_PLAN_PROJECTION
+            ).sort("date", -1).limit(days)
+            documents = await cursor.to_list(length=days)
             
             plans = []
-            async for document in collection.find({
-                "user_id": self.user_id,
-                "date": {
-                    "$gte": start_date.strftime("%Y-%m-%d"),
-                    "$lte": end_date.strftime("%Y-%m-%d")
-                }
-            }).sort("date", -1):
-                plans.append(DayPlan(**document))
-                
+            for document in documents:
+                # One unreadable document shouldn't hide the rest of the history
+                try:
+                    plans.append(_plan_from_doc(document))
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable plan {document.get('date')} {document.get('location')}: {e}")
             return plans
         except Exception as e:
             logger.error(f"Error fetching user plans: {e}")
             return []
 
-    async def force_plan_regeneration(self, location: str = "Berlin"):
-        """Force regeneration of plan for current conditions"""
+    async def force_plan_regeneration(self, location: str = "Berlin", weather_data: Optional[Dict[str, Any]] = None):
+        """
+        Force regeneration of plan for current conditions
+        
+        Pass already processed weather_data (as delivered to update()) to skip fetching it again.
+        """
         try:
-            from app.weather.weather_api import WeatherAPI
-            from app.weather.weather_station import WeatherStation
-            
-            weather_api = WeatherAPI()
-            weather_station = WeatherStation()
-            
-            # Get current weather
-            weather_data = await weather_api.get_weather_data(location)
-            condition = weather_api.map_weather_condition(weather_data)
-            
-            processed_data = {
-                "condition": condition,
-                "temperature": weather_data["main"]["temp"],
-                "humidity": weather_data["main"]["humidity"],
-                "description": weather_data["weather"][0]["description"],
-                "location": location
-            }
+            if weather_data is None:
+                # Get current weather, reusing a fresh cached fetch for the city
+                raw_data, condition = await _WEATHER_API.get_cached_weather(location)
+                weather_data = {
+                    "condition": condition,
+                    "temperature": raw_data["main"]["temp"],
+                    "humidity": raw_data["main"]["humidity"],
+                    "description": raw_data["weather"][0]["description"],
+                    "location": location
+                }
             
             # Regenerate plan
-            await self.generate_plan(processed_data, location)
+            await self.generate_plan(weather_data, location, force=True)
             logger.info(f"Plan regenerated for {location}")
             
         except Exception as e:
             logger.error(f"Error forcing plan regeneration: {e}")
 
     def get_plan_summary(self) -> Dict[str, Any]:
-        """Get summary of current plan"""
+        """Get summary of current plan (cached until the plan or preferences change; don't modify it)"""
         if not self.current_plan:
             return {"status": "no_plan", "message": "No current plan available"}
         
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
         plan = self.current_plan
-        return {
+        self._summary_cache = {
             "status": "active",
             "date": plan.date,
             "location": plan.location,
@@ -228,10 +402,12 @@ class DayPlanner(Observer):
                 "weekend_mode": self.user_preferences.weekend_mode
             }
         }
+        return self._summary_cache
 
-    async def clear_current_plan(self):
+    def clear_current_plan(self):
         """Clear the current plan"""
         self.current_plan = None
+        self._summary_cache = None
         logger.info("Current plan cleared")
 
     def __str__(self) -> str:
@@ -1,8 +1,57 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.db.models import Activity, UserPreferences
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+from typing import ClassVar, Dict, List, Tuple
+from app.db.models import Activity, ActivityType, UserPreferences
+
+_ALL_TYPES = frozenset(ActivityType)
 
 class WeatherStrategy(ABC):
+    """Base class for all weather strategies"""
+    
+    # Activity catalog of a strategy, kept sorted by priority (highest first)
+    _ACTIVITIES: ClassVar[Tuple[Activity, ...]] = ()
+    # Catalog grouped by type as (rank in _ACTIVITIES, activity) pairs, in rank order
+    _BY_TYPE: ClassVar[Dict[ActivityType, Tuple[Tuple[int, Activity], ...]]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_ACTIVITIES" in cls.__dict__:
+            # Sort once so the top-4 cut keeps the most important activities (stable for ties)
+            cls._ACTIVITIES = tuple(sorted(cls._ACTIVITIES, key=lambda activity: -activity.priority))
+            
+            by_type = defaultdict(list)
+            for rank, activity in enumerate(cls._ACTIVITIES):
+                by_type[activity.type].append((rank, activity))
+            cls._BY_TYPE = {activity_type: tuple(group) for activity_type, group in by_type.items()}
+    
     @abstractmethod
     async def get_activities(self, user_preferences: UserPreferences) -> List[Activity]:
-        pass
\ No newline at end of file
+        """
+        Get activities based on weather and user preferences
+        
+        Args:
+            user_preferences: User's activity preferences
+            
+        Returns:
+            List of recommended activities
+        """
+        pass
+    
+    def _select_activities(self, preferences: UserPreferences) -> List[Activity]:
+        """
+        Pick the top activities of this strategy's catalog for the user's preferences
+        
+        Same result as filtering _ACTIVITIES, but only the groups of allowed types are visited.
+        
+        Args:
+            preferences: User's preferences
+            
+        Returns:
+            Up to 4 activities, highest priority first
+        """
+        allowed = (frozenset(preferences.preferred_types) or _ALL_TYPES) - frozenset(preferences.avoid_types)
+        groups = [self._BY_TYPE[activity_type] for activity_type in allowed if activity_type in self._BY_TYPE]
+        # Ranks are unique, so merging never has to compare activities
+        return [activity for _, activity in islice(merge(*groups), 4)]
\ No newline at end of file
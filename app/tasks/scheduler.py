@@ -1,22 +1,29 @@
 import os
 import asyncio
+import heapq
+import platform
 import time
 from datetime import datetime
-from typing import Optional, Callable, Dict, List
+from typing import Optional, Callable, Dict, List, Set, Tuple
+
+def _timestamp(_strftime=time.strftime, _localtime=time.localtime) -> str:
+    """Local time for log lines, formatted without building a datetime"""
+    return _strftime('%Y-%m-%d %H:%M:%S', _localtime())
 
 # Simple logger if the app logger is not available
 class SimpleLogger:
-    def info(self, msg):
-        print(f"[INFO] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
+    # Messages take %-style args like the logging module
+    def info(self, msg, *args):
+        print(f"[INFO] {_timestamp()} {msg % args if args else msg}")
     
-    def warning(self, msg):
-        print(f"[WARN] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
+    def warning(self, msg, *args):
+        print(f"[WARN] {_timestamp()} {msg % args if args else msg}")
     
-    def error(self, msg):
-        print(f"[ERROR] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
+    def error(self, msg, *args):
+        print(f"[ERROR] {_timestamp()} {msg % args if args else msg}")
     
-    def debug(self, msg):
-        print(f"[DEBUG] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {msg}")
+    def debug(self, msg, *args):
+        print(f"[DEBUG] {_timestamp()} {msg % args if args else msg}")
 
 # Try to import app logger, fallback to simple logger
 try:
@@ -35,76 +42,151 @@ except ImportError:
 
 # ==================== CUSTOM SCHEDULER SYSTEM ====================
 
+# Scheduling and uptimes use the monotonic clock, so wall-clock changes can't shift jobs
+_time = time.monotonic
+
+def _to_wall_clock(monotonic_time: Optional[float]) -> Optional[float]:
+    """Convert a monotonic timestamp to a Unix timestamp for display"""
+    if monotonic_time is None:
+        return None
+    return time.time() - (_time() - monotonic_time)
+
+class JobInfo:
+    """A scheduled job"""
+    __slots__ = ("func", "interval", "id", "last_run", "next_run", "enabled", "is_coro", "task")
+    
+    def __init__(self, func: Callable, interval: float, id: str):
+        self.func = func
+        self.interval = interval
+        self.id = id
+        self.last_run: Optional[float] = None
+        self.next_run = _time() + interval  # Schedule first run
+        self.enabled = True
+        # Checked once here rather than on every run
+        self.is_coro = asyncio.iscoroutinefunction(func)
+        # The job's latest run, so a run that overruns its interval isn't started again
+        self.task: Optional[asyncio.Task] = None
+
 class CustomScheduler:
     """Custom scheduler that uses asyncio for background tasks - NO EXTERNAL DEPS"""
     
     def __init__(self):
-        self.tasks: List[Dict] = []
+        self.jobs: Dict[str, JobInfo] = {}
+        # (next_run, job id) min-heap; entries whose next_run no longer matches the job are stale
+        self._heap: List[Tuple[float, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # Jobs currently running (kept referenced so they aren't garbage collected)
+        self._inflight: Set[asyncio.Task] = set()
         self.running = False
         self._background_task: Optional[asyncio.Task] = None
-        self.start_time = time.time()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.start_time = _time()
         logger.info("Custom scheduler initialized (no external dependencies)")
     
     def add_job(self, func: Callable, trigger: str = "interval", seconds: int = 1800, id: str = None):
-        """Add a job to the scheduler"""
-        job_info = {
-            'func': func,
-            'interval': seconds,
-            'id': id or f"job_{len(self.tasks)}",
-            'last_run': None,
-            'next_run': time.time() + seconds,  # Schedule first run
-            'enabled': True
-        }
-        self.tasks.append(job_info)
-        logger.info(f"Added job: {job_info['id']} (every {seconds} seconds)")
+        """Add a job to the scheduler (a job with the same id is replaced)"""
+        job_info = JobInfo(func, seconds, id or f"job_{len(self.jobs)}")
+        self.jobs[job_info.id] = job_info
+        heapq.heappush(self._heap, (job_info.next_run, job_info.id))
+        self._wake()
+        logger.info("Added job: %s (every %s seconds)", job_info.id, seconds)
+    
+    def add_jobs(self, specs: List[Dict]):
+        """Add several jobs at once; each spec holds add_job's func, seconds and id"""
+        for spec in specs:
+            job_info = JobInfo(spec['func'], spec.get('seconds', 1800), spec.get('id') or f"job_{len(self.jobs)}")
+            self.jobs[job_info.id] = job_info
+            self._heap.append((job_info.next_run, job_info.id))
+        heapq.heapify(self._heap)
+        self._wake()
+        logger.info("Registered %d jobs", len(specs))
+    
+    def disable_job(self, job_id: str):
+        """Stop running a job; its heap entry is dropped when it comes up"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.enabled = False
+    
+    def enable_job(self, job_id: str):
+        """Resume a disabled job, one interval from now"""
+        job = self.jobs.get(job_id)
+        if job is None or job.enabled:
+            return
+        job.enabled = True
+        job.next_run = _time() + job.interval
+        heapq.heappush(self._heap, (job.next_run, job_id))
+        self._wake()
+    
+    def _wake(self):
+        """Make the scheduler loop re-check the heap now"""
+        if self._wakeup is not None:
+            self._wakeup.set()
     
-    async def _run_job(self, job_info: Dict):
+    async def _run_job(self, job_info: JobInfo):
         """Run a single job"""
-        if not job_info['enabled']:
+        if not job_info.enabled:
             return
             
         try:
-            logger.debug(f"Running job: {job_info['id']}")
-            job_info['last_run'] = time.time()
-            job_info['next_run'] = time.time() + job_info['interval']
+            logger.debug("Running job: %s", job_info.id)
+            job_info.last_run = _time()
             
             # Run the function (support both async and sync functions)
-            if asyncio.iscoroutinefunction(job_info['func']):
-                await job_info['func']()
+            if job_info.is_coro:
+                await job_info.func()
             else:
                 # Run sync functions in thread pool
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, job_info['func'])
+                await self._loop.run_in_executor(None, job_info.func)
                 
-            logger.debug(f"Completed job: {job_info['id']}")
+            logger.debug("Completed job: %s", job_info.id)
         except Exception as e:
-            logger.error(f"Job {job_info['id']} failed: {e}")
+            logger.error("Job %s failed: %s", job_info.id, e)
+    
+    def _pop_due_jobs(self, now: float) -> List[JobInfo]:
+        """Take due jobs off the heap and schedule their next runs"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_run, job_id = heapq.heappop(self._heap)
+            job = self.jobs.get(job_id)
+            if job is None or not job.enabled or job.next_run != next_run:
+                continue  # Stale entry (job replaced, disabled or rescheduled)
+            job.next_run = now + job.interval
+            heapq.heappush(self._heap, (job.next_run, job_id))
+            due.append(job)
+        return due
     
     async def _scheduler_loop(self):
-        """Main scheduler loop"""
+        """Main scheduler loop: sleeps until the next job is due"""
         logger.info("Starting custom scheduler loop")
         self.running = True
         
         while self.running:
-            current_time = time.time()
-            tasks_to_run = []
-            
-            # Find jobs that need to run
-            for job in self.tasks:
-                if job['enabled'] and current_time >= job['next_run']:
-                    tasks_to_run.append(job)
+            self._wakeup.clear()
+            due = self._pop_due_jobs(_time())
             
-            # Run all due jobs concurrently
-            if tasks_to_run:
-                run_tasks = [self._run_job(job) for job in tasks_to_run]
-                await asyncio.gather(*run_tasks, return_exceptions=True)
+            # Start due jobs without waiting for them, so a slow job can't delay the next one
+            for job in due:
+                if job.task is not None and not job.task.done():
+                    logger.debug("Skipping job %s: previous run still in progress", job.id)
+                    continue
+                job.task = asyncio.create_task(self._run_job(job))
+                self._inflight.add(job.task)
+                job.task.add_done_callback(self._inflight.discard)
             
-            # Sleep briefly before checking again
-            await asyncio.sleep(1)
+            # Sleep until the next job is due, or until woken by add_job/shutdown
+            delay = self._heap[0][0] - _time() if self._heap else None
+            if delay is not None and delay <= 0:
+                # More jobs are already due: just yield (no timer) and go again
+                await asyncio.sleep(0)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
     
     def start(self):
         """Start the scheduler"""
-        if not self.tasks:
+        if not self.jobs:
             logger.warning("No jobs added to scheduler")
             return self
         
@@ -113,41 +195,52 @@ class CustomScheduler:
             return self
         
         # Start the scheduler loop as a background task
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         self._background_task = asyncio.create_task(self._scheduler_loop())
-        logger.info(f"Custom scheduler started with {len(self.tasks)} jobs")
+        logger.info("Custom scheduler started with %d jobs", len(self.jobs))
         return self
     
     def shutdown(self):
         """Stop the scheduler"""
         self.running = False
+        self._wake()
         if self._background_task:
             self._background_task.cancel()
+        for task in self._inflight:
+            task.cancel()
         logger.info("Custom scheduler stopped")
     
     def get_job_status(self) -> List[Dict]:
         """Get status of all jobs"""
         status = []
-        for job in self.tasks:
+        for job in self.jobs.values():
             status.append({
-                'id': job['id'],
-                'enabled': job['enabled'],
-                'last_run': job['last_run'],
-                'next_run': job['next_run'],
-                'interval': job['interval']
+                'id': job.id,
+                'enabled': job.enabled,
+                'last_run': _to_wall_clock(job.last_run),
+                'next_run': _to_wall_clock(job.next_run),
+                'interval': job.interval
             })
         return status
     
     def get_uptime(self) -> float:
         """Get scheduler uptime in seconds"""
-        return time.time() - self.start_time
+        return _time() - self.start_time
 
 # ==================== SIMPLE SYSTEM MONITORING ====================
 
+# These can't change while the process runs, so look them up once
+_PLATFORM = platform.system()
+_PYTHON_VERSION = platform.python_version()
+
 class SystemMonitor:
     """Simple system monitoring without external dependencies"""
+    # Counters are only updated from the event loop thread, so plain += is safe
+    __slots__ = ("start_time", "request_count", "error_count")
     
     def __init__(self):
-        self.start_time = time.time()
+        self.start_time = _time()
         self.request_count = 0
         self.error_count = 0
     
@@ -159,32 +252,53 @@ class SystemMonitor:
         """Increment error counter"""
         self.error_count += 1
     
-    def get_system_info(self) -> Dict:
-        """Get basic system information"""
-        import platform
-        import sys
-        
-        uptime = time.time() - self.start_time
-        
-        # Convert uptime to readable format
-        hours = int(uptime // 3600)
-        minutes = int((uptime % 3600) // 60)
-        seconds = int(uptime % 60)
-        
+    def get_system_info(self, now: Optional[float] = None) -> Dict:
+        """Get basic system information as raw numbers (see format_uptime for display)"""
         return {
-            "platform": platform.system(),
-            "python_version": platform.python_version(),
-            "uptime": f"{hours}h {minutes}m {seconds}s",
-            "uptime_seconds": uptime,
+            "platform": _PLATFORM,
+            "python_version": _PYTHON_VERSION,
+            "uptime_seconds": _time() - self.start_time,
             "requests_processed": self.request_count,
             "errors_occurred": self.error_count,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time() if now is None else now
         }
 
+def format_uptime(seconds: float) -> str:
+    """Format an uptime in seconds as e.g. '1h 2m 3s'"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m {seconds}s"
+
 # Create global instances
 scheduler = CustomScheduler()
 system_monitor = SystemMonitor()
 
+def _collect_disk_and_mem():
+    """Probe free disk space (GB) and physical memory (MB), "Unknown" when unavailable"""
+    # Check disk space (simple version)
+    try:
+        if os.name == 'nt':  # Windows
+            import ctypes
+            free_bytes = ctypes.c_ulonglong(0)
+            ctypes.windll.kernel32.GetDiskFreeSpaceExW(
+                ctypes.c_wchar_p('C:\\'), None, None, ctypes.pointer(free_bytes)
+            )
+            disk_free_gb = free_bytes.value / (1024**3)
+        else:  # Unix/Linux
+            statvfs = os.statvfs('/')
+            disk_free_gb = (statvfs.f_bavail * statvfs.f_frsize) / (1024**3)
+    except OSError:
+        disk_free_gb = "Unknown"
+    
+    # Check memory (approximate)
+    try:
+        # This is a simple approximation and may not be accurate
+        memory_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024**2) if hasattr(os, 'sysconf') else "Unknown"
+    except (AttributeError, OSError, ValueError):
+        memory_mb = "Unknown"
+    
+    return disk_free_gb, memory_mb
+
 # ==================== WEATHER SERVICES ====================
 
 # Try to import weather services with fallbacks
@@ -196,13 +310,19 @@ try:
     WEATHER_SERVICES_AVAILABLE = True
     logger.info("Weather services imported successfully")
 except ImportError as e:
-    logger.warning(f"Weather services not available: {e}")
+    logger.warning("Weather services not available: %s", e)
     WEATHER_SERVICES_AVAILABLE = False
     
     # Fallback weather service
     class SimpleWeatherAPI:
+        _ID_TO_COND = {
+            **dict.fromkeys(range(200, 600), "Rainy"),
+            **dict.fromkeys(range(600, 700), "Snowy"),
+            800: "Sunny"
+        }
+        
         async def get_weather_data(self, city: str) -> dict:
-            logger.info(f"Getting mock weather data for {city}")
+            logger.info("Getting mock weather data for %s", city)
             # Return realistic mock data
             import random
             conditions = [
@@ -224,15 +344,7 @@ except ImportError as e:
             }
         
         def map_weather_condition(self, weather_data: dict) -> str:
-            weather_id = weather_data["weather"][0]["id"]
-            if 200 <= weather_id < 600:
-                return "Rainy"
-            elif 600 <= weather_id < 700:
-                return "Snowy"
-            elif weather_id == 800:
-                return "Sunny"
-            else:
-                return "Cloudy"
+            return self._ID_TO_COND.get(weather_data["weather"][0]["id"], "Cloudy")
     
     class SimpleWeatherStation:
         def __init__(self):
@@ -240,7 +352,7 @@ except ImportError as e:
         
         async def set_weather(self, weather_data: dict, city: str):
             self.current_weather = weather_data
-            logger.info(f"Weather station updated: {city} - {weather_data['condition']} {weather_data['temperature']}°C")
+            logger.info("Weather station updated: %s - %s %s°C", city, weather_data['condition'], weather_data['temperature'])
     
     weather_api = SimpleWeatherAPI()
     weather_station = SimpleWeatherStation()
@@ -269,49 +381,56 @@ async def scheduled_weather_update():
         }
         
         await weather_station.set_weather(processed_data, settings.DEFAULT_CITY)
-        logger.info(f"Weather update completed: {condition} {weather_data['main']['temp']}°C in {settings.DEFAULT_CITY}")
+        logger.info("Weather update completed: %s %s°C in %s", condition, weather_data['main']['temp'], settings.DEFAULT_CITY)
         
     except Exception as e:
-        logger.error(f"Scheduled weather update failed: {e}")
+        logger.error("Scheduled weather update failed: %s", e)
         system_monitor.increment_errors()
 
+# Health results are reused for a few seconds so bursts of callers don't re-probe the system
+_HEALTH_TTL = 5.0
+# Seeded at -inf so the empty cache is stale even when the monotonic clock starts near zero
+_HEALTH_CACHE = {"ts": float("-inf"), "value": None}
+_HEALTH_LOCK: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+
+def _health_lock() -> asyncio.Lock:
+    """Lock coalescing concurrent health checks, recreated for each event loop"""
+    global _HEALTH_LOCK
+    loop = asyncio.get_running_loop()
+    if _HEALTH_LOCK is None or _HEALTH_LOCK[0] is not loop:
+        _HEALTH_LOCK = (loop, asyncio.Lock())
+    return _HEALTH_LOCK[1]
+
 async def health_check():
-    """Simple health check task WITHOUT external dependencies"""
-    try:
-        # Basic system health checks without psutil
-        import platform
-        import sys
-        import os
-        
-        # Get basic system info
-        system_info = system_monitor.get_system_info()
+    """Simple health check task WITHOUT external dependencies, cached for a few seconds"""
+    if _time() - _HEALTH_CACHE["ts"] < _HEALTH_TTL:
+        return _HEALTH_CACHE["value"]
+    
+    async with _health_lock():
+        # Another caller may have refreshed the result while we waited
+        if _time() - _HEALTH_CACHE["ts"] < _HEALTH_TTL:
+            return _HEALTH_CACHE["value"]
         
-        # Check disk space (simple version)
-        try:
-            if os.name == 'nt':  # Windows
-                import ctypes
-                free_bytes = ctypes.c_ulonglong(0)
-                ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                    ctypes.c_wchar_p('C:\\'), None, None, ctypes.pointer(free_bytes)
-                )
-                disk_free_gb = free_bytes.value / (1024**3)
-            else:  # Unix/Linux
-                statvfs = os.statvfs('/')
-                disk_free_gb = (statvfs.f_bavail * statvfs.f_frsize) / (1024**3)
-        except:
-            disk_free_gb = "Unknown"
+        health_status = await _run_health_check()
+        if health_status["status"] == "healthy":
+            _HEALTH_CACHE["ts"] = _time()
+            _HEALTH_CACHE["value"] = health_status
+        return health_status
+
+async def _run_health_check():
+    """Probe system health and report it"""
+    try:
+        # Basic system health checks without psutil; one timestamp for the whole report
+        now = time.time()
+        system_info = system_monitor.get_system_info(now)
         
-        # Check memory (approximate)
-        try:
-            # This is a simple approximation and may not be accurate
-            memory_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024**2) if hasattr(os, 'sysconf') else "Unknown"
-        except:
-            memory_mb = "Unknown"
+        # Disk and memory probes are blocking syscalls, so keep them off the event loop
+        disk_free_gb, memory_mb = await asyncio.to_thread(_collect_disk_and_mem)
         
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "system_uptime": system_info["uptime"],
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+            "system_uptime": format_uptime(system_info["uptime_seconds"]),
             "scheduler_uptime": f"{int(scheduler.get_uptime())}s",
             "platform": system_info["platform"],
             "python_version": system_info["python_version"],
@@ -319,18 +438,17 @@ async def health_check():
             "memory_mb": memory_mb,
             "requests_processed": system_info["requests_processed"],
             "errors_occurred": system_info["errors_occurred"],
-            "active_jobs": len([job for job in scheduler.tasks if job['enabled']])
+            "active_jobs": sum(1 for job in scheduler.jobs.values() if job.enabled)
         }
         
-        logger.info(f"Health check - System: {health_status['status']}, "
-                   f"Uptime: {health_status['system_uptime']}, "
-                   f"Requests: {health_status['requests_processed']}, "
-                   f"Errors: {health_status['errors_occurred']}")
+        logger.info("Health check - System: %s, Uptime: %s, Requests: %s, Errors: %s",
+                    health_status['status'], health_status['system_uptime'],
+                    health_status['requests_processed'], health_status['errors_occurred'])
         
         return health_status
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         system_monitor.increment_errors()
         return {
             "status": "unhealthy",
@@ -348,18 +466,17 @@ async def data_cleanup():
         temp_dir = "temp"
         if os.path.exists(temp_dir):
             now = time.time()
-            for filename in os.listdir(temp_dir):
-                filepath = os.path.join(temp_dir, filename)
-                if os.path.isfile(filepath):
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
                     # Remove files older than 24 hours
-                    if now - os.path.getctime(filepath) > 86400:
-                        os.remove(filepath)
-                        logger.debug(f"🧹 Removed old file: {filename}")
+                    if entry.is_file(follow_symlinks=False) and now - entry.stat().st_ctime > 86400:
+                        os.remove(entry.path)
+                        logger.debug("🧹 Removed old file: %s", entry.name)
         
         logger.info("Data cleanup completed")
         
     except Exception as e:
-        logger.error(f"Data cleanup failed: {e}")
+        logger.error("Data cleanup failed: %s", e)
         system_monitor.increment_errors()
 
 # ==================== SCHEDULER MANAGEMENT ====================
@@ -370,33 +487,21 @@ def start_scheduler():
     
     logger.info("Starting custom scheduler (no external dependencies required)")
     
-    # Add weather update job
-    scheduler.add_job(
-        scheduled_weather_update,
-        seconds=settings.WEATHER_UPDATE_INTERVAL,
-        id="weather_update"
-    )
-    
-    # Add health check job (every 5 minutes)
-    scheduler.add_job(
-        health_check,
-        seconds=300,
-        id="health_check"
-    )
-    
-    # Add cleanup job (every hour)
-    scheduler.add_job(
-        data_cleanup,
-        seconds=3600,
-        id="data_cleanup"
-    )
+    scheduler.add_jobs([
+        # Weather updates
+        {"func": scheduled_weather_update, "seconds": settings.WEATHER_UPDATE_INTERVAL, "id": "weather_update"},
+        # Health check (every 5 minutes)
+        {"func": health_check, "seconds": 300, "id": "health_check"},
+        # Cleanup (every hour)
+        {"func": data_cleanup, "seconds": 3600, "id": "data_cleanup"}
+    ])
     
     # Start the scheduler
     scheduler.start()
     
-    logger.info(f"Custom scheduler started successfully")
-    logger.info(f"Weather updates every {settings.WEATHER_UPDATE_INTERVAL} seconds")
-    logger.info(f"Default city: {settings.DEFAULT_CITY}")
+    logger.info("Custom scheduler started successfully")
+    logger.info("Weather updates every %s seconds", settings.WEATHER_UPDATE_INTERVAL)
+    logger.info("Default city: %s", settings.DEFAULT_CITY)
     
     return scheduler
 
@@ -411,7 +516,7 @@ def get_scheduler_status() -> Dict:
     return {
         "scheduler_type": "custom",
         "running": scheduler.running,
-        "total_jobs": len(scheduler.tasks),
+        "total_jobs": len(scheduler.jobs),
         "weather_services_available": WEATHER_SERVICES_AVAILABLE,
         "update_interval": settings.WEATHER_UPDATE_INTERVAL,
         "default_city": settings.DEFAULT_CITY,
@@ -450,27 +555,6 @@ async def get_system_status():
         "timestamp": datetime.now().isoformat()
     }
 
-# ==================== INITIALIZATION ====================
-
-# Auto-start scheduler when module is imported (in production)
-_AUTO_START = os.getenv("AUTO_START_SCHEDULER", "true").lower() == "true"
-
-if _AUTO_START and __name__ != "__main__":
-    # Schedule startup after a brief delay
-    async def delayed_start():
-        await asyncio.sleep(5)  # Wait 5 seconds for other services to initialize
-        start_scheduler()
-    
-    # Start the delayed initialization
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            loop.create_task(delayed_start())
-        else:
-            loop.run_until_complete(delayed_start())
-    except:
-        logger.info("Scheduler auto-start scheduled")
-
 # ==================== TEST FUNCTIONS ====================
 
 async def test_scheduler():
@@ -478,21 +562,21 @@ async def test_scheduler():
     logger.info("Testing scheduler system...")
     
     status = get_scheduler_status()
-    logger.info(f"Scheduler status: {status}")
+    logger.info("Scheduler status: %s", status)
     
     # Test manual weather update
     try:
         result = await trigger_weather_update_manual()
         logger.info("Manual weather update test passed")
     except Exception as e:
-        logger.error(f"Manual weather update test failed: {e}")
+        logger.error("Manual weather update test failed: %s", e)
     
     # Test manual health check
     try:
         result = await trigger_health_check_manual()
         logger.info("Manual health check test passed")
     except Exception as e:
-        logger.error(f"Manual health check test failed: {e}")
+        logger.error("Manual health check test failed: %s", e)
     
     return status
 
@@ -526,7 +610,7 @@ if __name__ == "__main__":
         print(f"   Weather Services: {status['weather_services_available']}")
         print(f"   Update Interval: {status['update_interval']} seconds")
         print(f"   Default City: {status['default_city']}")
-        print(f"   System Uptime: {status['system_info']['uptime']}")
+        print(f"   System Uptime: {format_uptime(status['system_info']['uptime_seconds'])}")
         print(f"   Requests: {status['system_info']['requests_processed']}")
         print("\nJobs:")
         for job in status['jobs']:
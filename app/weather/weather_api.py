@@ -1,13 +1,110 @@
 import os
+import time
 import random
+import asyncio
+import datetime
+from itertools import accumulate
+from typing import Dict, Tuple
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.logger import logger
 from app.weather.weather_station import WeatherCondition
 
+# Generator for the mock data, kept separate from the global random state
+_RNG = random.Random()
+
+# Temperature ranges used for the seasonal mock data
+_SEASON_TEMP_RANGES = {
+    "winter": (-5, 10),
+    "spring": (5, 20),
+    "summer": (15, 35),
+    "autumn": (5, 18)
+}
+
+_MONTH_TO_SEASON = (
+    None,
+    "winter", "winter",
+    "spring", "spring", "spring",
+    "summer", "summer", "summer",
+    "autumn", "autumn", "autumn",
+    "winter"
+)
+
+def _weighted(conditions):
+    """Split (condition, weight) pairs into a conditions tuple and cumulative weights"""
+    return tuple(c for c, _ in conditions), tuple(accumulate(w for _, w in conditions))
+
+# Weighted weather conditions per season, as (conditions, cum_weights) for random.choices
+_SEASON_CONDITIONS = {
+    "winter": _weighted([
+        ({"id": 600, "main": "Snow", "description": "light snow"}, 4),
+        ({"id": 601, "main": "Snow", "description": "snow"}, 3),
+        ({"id": 800, "main": "Clear", "description": "clear sky"}, 2),
+        ({"id": 801, "main": "Clouds", "description": "few clouds"}, 1)
+    ]),
+    "spring": _weighted([
+        ({"id": 500, "main": "Rain", "description": "light rain"}, 3),
+        ({"id": 801, "main": "Clouds", "description": "few clouds"}, 3),
+        ({"id": 800, "main": "Clear", "description": "clear sky"}, 2),
+        ({"id": 300, "main": "Drizzle", "description": "light intensity drizzle"}, 2)
+    ]),
+    "summer": _weighted([
+        ({"id": 800, "main": "Clear", "description": "clear sky"}, 5),
+        ({"id": 801, "main": "Clouds", "description": "few clouds"}, 3),
+        ({"id": 802, "main": "Clouds", "description": "scattered clouds"}, 1),
+        ({"id": 500, "main": "Rain", "description": "light rain"}, 1)
+    ]),
+    "autumn": _weighted([
+        ({"id": 801, "main": "Clouds", "description": "few clouds"}, 3),
+        ({"id": 500, "main": "Rain", "description": "light rain"}, 3),
+        ({"id": 800, "main": "Clear", "description": "clear sky"}, 2),
+        ({"id": 802, "main": "Clouds", "description": "scattered clouds"}, 2)
+    ])
+}
+
+# OpenWeather condition id -> WeatherCondition; unlisted ids (atmosphere, clouds) are cloudy
+_ID_TO_COND = {
+    **dict.fromkeys(range(200, 600), WeatherCondition.RAINY),  # Thunderstorm, Drizzle, Rain
+    **dict.fromkeys(range(600, 700), WeatherCondition.SNOWY),  # Snow
+    800: WeatherCondition.SUNNY  # Clear
+}
+
 class WeatherAPI:
     def __init__(self):
         self.api_key = settings.OPENWEATHER_API_KEY
         self.base_url = settings.OPENWEATHER_BASE_URL
+        self.cache_ttl = settings.WEATHER_CACHE_TTL
+        # city -> (fetched_at, weather_data, condition), bounded so unseen cities age out
+        self._cache = TTLCache(maxsize=256, ttl=self.cache_ttl)
+        # Only held for cities with a fetch in progress
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get_cached_weather(self, city: str) -> Tuple[dict, WeatherCondition]:
+        """Get weather data and its mapped condition, reusing results younger than the cache TTL"""
+        entry = self._cache.get(city)
+        if entry and time.monotonic() - entry[0] < self.cache_ttl:
+            return entry[1], entry[2]
+        
+        lock = self._locks.setdefault(city, asyncio.Lock())
+        async with lock:
+            try:
+                # Another request may have refreshed the entry while we waited
+                entry = self._cache.get(city)
+                if entry and time.monotonic() - entry[0] < self.cache_ttl:
+                    return entry[1], entry[2]
+                
+                weather_data = await self.get_weather_data(city)
+                condition = self.map_weather_condition(weather_data)
+                self._cache[city] = (time.monotonic(), weather_data, condition)
+                return weather_data, condition
+            finally:
+                # Waiters keep their reference and find the fresh entry, so the lock can go
+                if self._locks.get(city) is lock:
+                    del self._locks[city]
+
+    def clear_cache(self):
+        """Drop all cached weather data"""
+        self._cache.clear()
 
     async def get_weather_data(self, city: str) -> dict:
         """Get weather data - uses mock data for development"""
@@ -18,67 +115,17 @@ class WeatherAPI:
 
     def _get_mock_weather_data(self, city: str) -> dict:
         """Generate realistic mock weather data"""
-        # More realistic mock data with seasonal variations
-        seasons = {
-            "winter": {"temp_range": (-5, 10), "snow_chance": 0.4},
-            "spring": {"temp_range": (5, 20), "rain_chance": 0.3},
-            "summer": {"temp_range": (15, 35), "sunny_chance": 0.6},
-            "autumn": {"temp_range": (5, 18), "cloudy_chance": 0.5}
-        }
-        
         # Simple season detection based on month
-        import datetime
-        month = datetime.datetime.now().month
-        if month in [12, 1, 2]:
-            season = "winter"
-        elif month in [3, 4, 5]:
-            season = "spring"
-        elif month in [6, 7, 8]:
-            season = "summer"
-        else:
-            season = "autumn"
-            
-        season_data = seasons[season]
-        temp_range = season_data["temp_range"]
+        season = _MONTH_TO_SEASON[datetime.datetime.now().month]
+        temp_range = _SEASON_TEMP_RANGES[season]
         
-        # Weighted random choice for weather conditions based on season
-        if season == "winter":
-            conditions = [
-                {"id": 600, "main": "Snow", "description": "light snow", "weight": 4},
-                {"id": 601, "main": "Snow", "description": "snow", "weight": 3},
-                {"id": 800, "main": "Clear", "description": "clear sky", "weight": 2},
-                {"id": 801, "main": "Clouds", "description": "few clouds", "weight": 1}
-            ]
-        elif season == "spring":
-            conditions = [
-                {"id": 500, "main": "Rain", "description": "light rain", "weight": 3},
-                {"id": 801, "main": "Clouds", "description": "few clouds", "weight": 3},
-                {"id": 800, "main": "Clear", "description": "clear sky", "weight": 2},
-                {"id": 300, "main": "Drizzle", "description": "light intensity drizzle", "weight": 2}
-            ]
-        elif season == "summer":
-            conditions = [
-                {"id": 800, "main": "Clear", "description": "clear sky", "weight": 5},
-                {"id": 801, "main": "Clouds", "description": "few clouds", "weight": 3},
-                {"id": 802, "main": "Clouds", "description": "scattered clouds", "weight": 1},
-                {"id": 500, "main": "Rain", "description": "light rain", "weight": 1}
-            ]
-        else:  # autumn
-            conditions = [
-                {"id": 801, "main": "Clouds", "description": "few clouds", "weight": 3},
-                {"id": 500, "main": "Rain", "description": "light rain", "weight": 3},
-                {"id": 800, "main": "Clear", "description": "clear sky", "weight": 2},
-                {"id": 802, "main": "Clouds", "description": "scattered clouds", "weight": 2}
-            ]
+        randint = _RNG.randint
         
-        # Weighted random selection
-        weighted_conditions = []
-        for condition in conditions:
-            weighted_conditions.extend([condition] * condition["weight"])
-        
-        selected_condition = random.choice(weighted_conditions)
-        temperature = random.randint(temp_range[0], temp_range[1])
-        humidity = random.randint(40, 85)
+        # Weighted random choice for weather conditions based on season
+        conditions, cum_weights = _SEASON_CONDITIONS[season]
+        selected_condition = _RNG.choices(conditions, cum_weights=cum_weights)[0]
+        temperature = randint(temp_range[0], temp_range[1])
+        humidity = randint(40, 85)
         
         return {
             "weather": [{
@@ -89,27 +136,16 @@ class WeatherAPI:
             "main": {
                 "temp": temperature,
                 "humidity": humidity,
-                "feels_like": temperature - random.randint(0, 3),
-                "pressure": random.randint(1000, 1020)
+                "feels_like": temperature - randint(0, 3),
+                "pressure": randint(1000, 1020)
             },
             "wind": {
-                "speed": random.uniform(0, 10),
-                "deg": random.randint(0, 360)
+                "speed": _RNG.uniform(0, 10),
+                "deg": randint(0, 360)
             },
             "name": city,
-            "visibility": random.randint(5000, 10000)
+            "visibility": randint(5000, 10000)
         }
 
     def map_weather_condition(self, weather_data: dict) -> WeatherCondition:
-        weather_id = weather_data["weather"][0]["id"]
-        
-        if 200 <= weather_id < 600:  # Thunderstorm, Drizzle, Rain
-            return WeatherCondition.RAINY
-        elif 600 <= weather_id < 700:  # Snow
-            return WeatherCondition.SNOWY
-        elif weather_id == 800:  # Clear
-            return WeatherCondition.SUNNY
-        elif weather_id > 800:  # Clouds
-            return WeatherCondition.CLOUDY
-        else:
-            return WeatherCondition.CLOUDY
\ No newline at end of file
+        return _ID_TO_COND.get(weather_data["weather"][0]["id"], WeatherCondition.CLOUDY)
\ No newline at end of file
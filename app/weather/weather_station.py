@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict
 from enum import Enum
 from app.core.logger import logger
 
@@ -10,28 +11,40 @@ class WeatherCondition(str, Enum):
     SNOWY = "Snowy"
 
 class Observer(ABC):
+    # No instance dict of its own, so observers can use __slots__
+    __slots__ = ()
+    
     @abstractmethod
     async def update(self, weather_data: dict):
         pass
 
 class WeatherStation:
     def __init__(self):
-        self._observers: List[Observer] = []
+        # Used as an ordered set: O(1) attach/detach, observers notified in attach order
+        self._observers: Dict[Observer, None] = {}
         self._current_weather = None
         self._current_city = None
 
     def attach(self, observer: Observer):
         if observer not in self._observers:
-            self._observers.append(observer)
-            logger.info(f"Observer attached: {type(observer).__name__}")
+            self._observers[observer] = None
+            logger.info("Observer attached: %s", type(observer).__name__)
 
     def detach(self, observer: Observer):
-        self._observers.remove(observer)
-        logger.info(f"Observer detached: {type(observer).__name__}")
+        if observer in self._observers:
+            del self._observers[observer]
+            logger.info("Observer detached: %s", type(observer).__name__)
 
     async def notify(self, weather_data: dict):
-        for observer in self._observers:
-            await observer.update(weather_data)
+        # Observers are independent, so update them concurrently from a snapshot
+        observers = list(self._observers)
+        results = await asyncio.gather(
+            *(observer.update(weather_data) for observer in observers),
+            return_exceptions=True
+        )
+        for observer, result in zip(observers, results):
+            if isinstance(result, Exception):
+                logger.error("Observer %s failed to update: %s", type(observer).__name__, result)
 
     async def set_weather(self, weather_data: dict, city: str):
         old_weather = self._current_weather
@@ -39,7 +52,7 @@ class WeatherStation:
         self._current_city = city
         
         if old_weather != weather_data:
-            logger.info(f"Weather updated for {city}: {weather_data.get('condition', 'Unknown')}")
+            logger.info("Weather updated for %s: %s", city, weather_data.get('condition', 'Unknown'))
             await self.notify(weather_data)
 
     def get_current_weather(self):
@@ -1,17 +1,46 @@
 import sys
 import os
+import atexit
+import shutil
+import tempfile
 import pytest
 import asyncio
 
 # Додати корінь проекту до Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Keep the shared fallback store out of the working tree; every test process
+# (including each pytest-xdist worker) gets its own temporary directory
+_STORAGE_DIR = tempfile.mkdtemp(prefix="day_planner_tests_")
+atexit.register(shutil.rmtree, _STORAGE_DIR, ignore_errors=True)
+os.environ.setdefault("FALLBACK_STORAGE_PATH", os.path.join(_STORAGE_DIR, "fallback_storage.json"))
+
+# The tests make few concurrent queries, so a small MongoDB pool is enough
+os.environ.setdefault("MONGODB_MAX_POOL_SIZE", "3")
+os.environ.setdefault("MONGODB_MIN_POOL_SIZE", "0")
+
 from app.main import app
+from app.db.mongodb import FallbackStorage
+from app.planner.day_planner import wait_for_pending_saves
 from app.db.models import UserPreferences, Activity, ActivityType
 from app.planner.strategies.sunny import SunnyWeatherStrategy
 from app.planner.strategies.rainy import RainyWeatherStrategy
 from app.planner.strategies.cloudy import CloudyWeatherStrategy
 from app.planner.strategies.snowy import SnowyWeatherStrategy
+from app.weather.weather_api import WeatherAPI
+from app.weather.weather_station import WeatherStation
+
+def pytest_addoption(parser):
+    parser.addoption("--run-mongo", action="store_true", default=False, help="run tests that need a live MongoDB")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked mongo unless --run-mongo is given"""
+    if config.getoption("--run-mongo"):
+        return
+    skip_mongo = pytest.mark.skip(reason="needs --run-mongo")
+    for item in items:
+        if "mongo" in item.keywords:
+            item.add_marker(skip_mongo)
 
 @pytest.fixture
 def client():
@@ -19,9 +48,9 @@ def client():
     from fastapi.testclient import TestClient
     return TestClient(app)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_preferences():
-    """Sample user preferences for testing"""
+    """Sample user preferences for testing (read-only, shared by the session)"""
     return UserPreferences(
         preferred_types=[ActivityType.OUTDOOR, ActivityType.LEARNING],
         avoid_types=[ActivityType.SPORT],
@@ -29,9 +58,9 @@ def sample_user_preferences():
         weekend_mode=True
     )
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_activity():
-    """Sample activity for testing"""
+    """Sample activity for testing (read-only, shared by the session)"""
     return Activity(
         name="Test Activity",
         type=ActivityType.OUTDOOR,
@@ -39,19 +68,41 @@ def sample_activity():
         description="Test description"
     )
 
+@pytest.fixture(
+    params=[SunnyWeatherStrategy, RainyWeatherStrategy, CloudyWeatherStrategy, SnowyWeatherStrategy],
+    ids=["sunny", "rainy", "cloudy", "snowy"]
+)
+def strategy(request):
+    """Each weather strategy in turn, so every strategy is its own test item"""
+    return request.param()
+
 @pytest.fixture
-def all_strategies():
-    """All weather strategies for testing"""
-    return [
-        SunnyWeatherStrategy(),
-        RainyWeatherStrategy(),
-        CloudyWeatherStrategy(),
-        SnowyWeatherStrategy()
-    ]
+async def db(tmp_path, monkeypatch):
+    """Fresh fallback storage for one test, backed by a temporary file"""
+    from app.db import mongodb as mongodb_module
+    storage = FallbackStorage(str(tmp_path / "fallback_storage.json"))
+    monkeypatch.setattr(mongodb_module, "fallback_storage", storage)
+    monkeypatch.setattr(mongodb_module.mongodb, "use_fallback", True)
+    storage.start_flusher()
+    yield storage
+    await storage.stop_flusher()
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
\ No newline at end of file
+def weather_api():
+    """WeatherAPI shared by the tests that don't change its settings"""
+    return WeatherAPI()
+
+@pytest.fixture
+def weather_station():
+    """A fresh WeatherStation, so observers and current weather don't leak between tests"""
+    return WeatherStation()
+
+@pytest.fixture(autouse=True)
+async def finish_background_tasks():
+    """Finish background work a test started before its event loop is closed"""
+    yield
+    await wait_for_pending_saves()
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pytest
+import asyncio
 from fastapi.testclient import TestClient
 
 class TestAPI:
@@ -29,6 +30,35 @@ class TestAPI:
         # Should return 200 or 500 depending on weather service availability
         assert response.status_code in [200, 500]
 
+    def test_weather_update_rejected_when_busy(self, client, monkeypatch):
+        """Test weather updates are rejected once no slot frees up in time"""
+        from app.api import routes
+        monkeypatch.setattr(routes, "_WEATHER_SEM", None)
+        monkeypatch.setattr(routes.settings, "WEATHER_CONCURRENCY", 0)
+        monkeypatch.setattr(routes.settings, "WEATHER_QUEUE_TIMEOUT", 0.01)
+        
+        response = client.post("/api/v1/weather/update?city=Berlin")
+        assert response.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_cancelled_weather_update_frees_its_slot(self, monkeypatch):
+        """Test a weather update cancelled mid-fetch gives its semaphore slot back"""
+        from app.api import routes
+        
+        class SlowWeatherAPI:
+            async def get_cached_weather(self, city):
+                await asyncio.sleep(1)
+        
+        monkeypatch.setattr(routes, "_WEATHER_SEM", None)
+        monkeypatch.setattr(routes, "_services", lambda: (SlowWeatherAPI(), None, None))
+        
+        task = asyncio.create_task(routes._do_update("Berlin"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert routes._weather_sem()._value == routes.settings.WEATHER_CONCURRENCY
+
     def test_get_current_plan(self, client):
         """Test get current plan endpoint"""
         response = client.get("/api/v1/plan/current")
@@ -45,4 +75,50 @@ class TestAPI:
         }
         
         response = client.post("/api/v1/preferences", json=preferences)
-        assert response.status_code in [200, 500]
\ No newline at end of file
+        assert response.status_code in [200, 500]
+
+    def test_update_preferences_invalid(self, client):
+        """Test invalid preferences are rejected by request validation"""
+        response = client.post("/api/v1/preferences", json={"preferred_types": ["unknown"]})
+        assert response.status_code == 422
+
+    def test_preferences_cache_invalidation(self, client):
+        """Test cached preferences are refreshed after an update"""
+        client.get("/api/v1/preferences")
+        
+        preferences = {"preferred_types": ["indoor"], "avoid_types": []}
+        response = client.post("/api/v1/preferences", json=preferences)
+        assert response.status_code == 200
+        
+        response = client.get("/api/v1/preferences")
+        assert response.status_code == 200
+        assert response.json()["preferred_types"] == ["indoor"]
+
+    def test_etag_revalidation(self, client):
+        """Test GET responses carry an ETag and revalidate with 304"""
+        response = client.get("/health")
+        etag = response.headers.get("etag")
+        assert etag is not None
+        
+        response = client.get("/health", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_response_cache_coalesces_concurrent_calls(self):
+        """Test concurrent cache misses for the same key share one handler call"""
+        from app.core.cache import ResponseCache
+        
+        cache = ResponseCache()
+        calls = 0
+        
+        @cache.cached(expire=10, namespace="test")
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"calls": calls}
+        
+        results = await asyncio.gather(*(handler() for _ in range(5)))
+        assert calls == 1
+        assert all(result == {"calls": 1} for result in results)
@@ -1,22 +1,26 @@
 import pytest
 import asyncio
-from app.db.mongodb import connect_to_mongo, get_collection, save_plan, get_plan
+import json
+import os
+import time
+from app.db.mongodb import connect_to_mongo, get_collection, save_plan, get_plan, FallbackStorage
 from app.db.models import Activity, ActivityType
 
 class TestDatabase:
+    @pytest.mark.mongo
     @pytest.mark.asyncio
     async def test_database_connection(self):
         """Test database connection (will use fallback if MongoDB not available)"""
         await connect_to_mongo()
 
     @pytest.mark.asyncio
-    async def test_fallback_storage(self):
+    async def test_fallback_storage(self, db):
         """Test fallback storage operations"""
-    
+        user_id = "test_user"
         test_plan = {
             "date": "2024-01-01",
             "location": "Test City",
-            "user_id": "test_user",
+            "user_id": user_id,
             "weather": {"condition": "Sunny", "temperature": 25},
             "activities": [
                 {"name": "Testing", "type": "indoor", "priority": 1}
@@ -26,37 +30,166 @@ class TestDatabase:
         result = await save_plan(test_plan)
         assert result is True
         
-        plan_id = "plan_2024-01-01_Test City_test_user"
+        plan_id = f"plan_2024-01-01_Test City_{user_id}"
         retrieved_plan = await get_plan(plan_id)
         assert retrieved_plan is not None
         assert retrieved_plan["location"] == "Test City"
 
+        # Saving the same day again updates the plan instead of adding another
+        test_plan["weather"] = {"condition": "Rainy", "temperature": 12}
+        assert await save_plan(test_plan) is True
+        assert len(await db.get_collection("plans").find({"user_id": user_id})) == 1
+        retrieved_plan = await get_plan(plan_id)
+        assert retrieved_plan["weather"]["condition"] == "Rainy"
+
     @pytest.mark.asyncio
-    async def test_collection_operations(self):
+    async def test_collection_operations(self, db):
         """Test collection operations with fallback"""
         collection = get_collection("test_collection")
         assert collection is not None
         
-        test_doc = {"name": "test_document", "value": 42}
-        await collection.insert_one(test_doc)
+        name = "test_document"
+        test_doc = {"name": name, "value": 42}
+        test_doc2 = {"name": f"{name}_2", "value": 50}
+        await collection.insert_many([test_doc, test_doc2])
         
-        found_doc = await collection.find_one({"name": "test_document"})
+        found_doc = await collection.find_one({"name": name})
         assert found_doc is not None
         assert found_doc["value"] == 42  
         
-        test_doc2 = {"name": "test_document_2", "value": 50}
-        await collection.insert_one(test_doc2)
-        
         await collection.update_one(
-            {"name": "test_document_2"},
+            {"name": f"{name}_2"},
             {"$set": {"value": 100}}
         )
         
-        updated_doc = await collection.find_one({"name": "test_document_2"})
+        updated_doc = await collection.find_one({"name": f"{name}_2"})
         assert updated_doc is not None
         assert updated_doc["value"] == 100 
         
 
-        original_doc = await collection.find_one({"name": "test_document"})
+        original_doc = await collection.find_one({"name": name})
         assert original_doc is not None
-        assert original_doc["value"] == 42 
\ No newline at end of file
+        assert original_doc["value"] == 42 
+
+    @pytest.mark.asyncio
+    async def test_fallback_indexes_follow_updates(self, db):
+        """Test indexed lookups stay correct when indexed fields change"""
+        collection = get_collection("test_indexes")
+        doc_id = "indexed"
+        
+        await collection.insert_one({"_id": doc_id, "user_id": "user_a", "date": "2024-01-02"})
+        await collection.update_one({"_id": doc_id}, {"$set": {"user_id": "user_b"}})
+        
+        assert await collection.find_one({"user_id": "user_a", "date": "2024-01-02"}) is None
+        found = await collection.find_one({"user_id": "user_b", "date": "2024-01-02"})
+        assert found is not None
+        assert found["_id"] == doc_id
+
+    @pytest.mark.asyncio
+    async def test_fallback_storage_flush(self, tmp_path):
+        """Test fallback writes are batched until the storage is flushed"""
+        storage = FallbackStorage(str(tmp_path / "storage.json"))
+        
+        collection = storage.get_collection("flush_test")
+        await collection.insert_one({"name": "flushed"})
+        assert not os.path.exists(storage.file_path)
+        
+        await storage.flush()
+        with open(storage.file_path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["flush_test"][0]["name"] == "flushed"
+
+    @pytest.mark.asyncio
+    async def test_fallback_failed_flush_is_retried(self, tmp_path):
+        """Test changes stay pending when a write fails and go out with the next flush"""
+        storage = FallbackStorage(str(tmp_path / "missing_dir" / "storage.json"))
+        await storage.get_collection("retry_test").insert_one({"name": "kept"})
+        
+        await storage.flush()
+        assert not os.path.exists(storage.file_path)
+        
+        storage.file_path = str(tmp_path / "storage.json")
+        await storage.flush()
+        with open(storage.file_path, encoding="utf-8") as f:
+            assert json.load(f)["retry_test"][0]["name"] == "kept"
+
+    @pytest.mark.asyncio
+    async def test_stop_flusher_waits_for_inflight_write(self, tmp_path, monkeypatch):
+        """Test stopping the flusher mid-write waits for that write instead of skipping it"""
+        storage = FallbackStorage(str(tmp_path / "storage.json"))
+        write = storage._write
+        
+        def slow_write(payload):
+            time.sleep(0.1)
+            return write(payload)
+        
+        monkeypatch.setattr(storage, "_write", slow_write)
+        await storage.get_collection("stop_test").insert_one({"name": "last"})
+        storage.start_flusher(interval=0.01)
+        await asyncio.sleep(0.05)  # The flusher is now inside the slow write
+        
+        await storage.stop_flusher()
+        with open(storage.file_path, encoding="utf-8") as f:
+            assert json.load(f)["stop_test"][0]["name"] == "last"
+
+    @pytest.mark.asyncio
+    async def test_fallback_replace_one_upsert(self, db):
+        """Test replace_one inserts when missing and replaces in place otherwise"""
+        collection = get_collection("test_replace")
+        key = {"user_id": "replace_user", "date": "2024-01-03"}
+        
+        await collection.replace_one(key, {**key, "value": 1, "extra": True}, upsert=True)
+        first = await collection.find_one(key)
+        assert first["value"] == 1
+        
+        await collection.replace_one(key, {**key, "value": 2}, upsert=True)
+        assert len(await collection.find(key)) == 1
+        second = await collection.find_one(key)
+        assert second["value"] == 2
+        assert "extra" not in second
+        assert second["_id"] == first["_id"]
+
+    @pytest.mark.asyncio
+    async def test_fallback_lazy_index(self, db):
+        """Test fields indexed on first query stay correct through inserts and updates"""
+        collection = db.get_collection("lazy_index")
+        
+        await collection.insert_one({"_id": "a", "name": "first"})
+        assert (await collection.find_one({"name": "first"}))["_id"] == "a"
+        assert "name" in collection._indexed_fields
+        
+        await collection.insert_one({"_id": "b", "name": "second"})
+        await collection.update_one({"_id": "a"}, {"$set": {"name": "renamed"}})
+        assert await collection.find_one({"name": "first"}) is None
+        assert (await collection.find_one({"name": "second"}))["_id"] == "b"
+        assert (await collection.find_one({"name": "renamed"}))["_id"] == "a"
+
+    @pytest.mark.asyncio
+    async def test_reconnect_leaves_fallback(self, monkeypatch):
+        """Test a successful connect after an earlier failure stops using fallback storage"""
+        from app.db import mongodb as mongodb_module
+        
+        class FakeDatabase:
+            async def command(self, name):
+                return {"ok": 1}
+        
+        class FakeClient:
+            def __init__(self, *args, **kwargs):
+                pass
+            
+            def __getitem__(self, name):
+                return FakeDatabase()
+        
+        async def no_indexes():
+            pass
+        
+        monkeypatch.setattr(mongodb_module, "MONGODB_AVAILABLE", True)
+        monkeypatch.setattr(mongodb_module, "AsyncIOMotorClient", FakeClient)
+        monkeypatch.setattr(mongodb_module, "create_indexes", no_indexes)
+        monkeypatch.setattr(mongodb_module.mongodb, "client", None)
+        monkeypatch.setattr(mongodb_module.mongodb, "database", None)
+        monkeypatch.setattr(mongodb_module.mongodb, "use_fallback", True)
+        
+        await connect_to_mongo()
+        assert mongodb_module.mongodb.use_fallback is False
+        assert isinstance(mongodb_module.mongodb.database, FakeDatabase)
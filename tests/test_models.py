@@ -18,15 +18,21 @@ class TestModels:
         assert activity.priority == 3
         assert activity.description == "Test description"
 
-    def test_activity_priority_validation(self):
+    @pytest.mark.parametrize("priority, valid", [(5, True), (6, False)])
+    def test_activity_priority_validation(self, priority, valid):
         """Test Activity priority validation"""
-        # Valid priority
-        activity = Activity(name="Test", type=ActivityType.OUTDOOR, priority=5)
-        assert activity.priority == 5
-        
-        # Invalid priority should raise error
+        if valid:
+            activity = Activity(name="Test", type=ActivityType.OUTDOOR, priority=priority)
+            assert activity.priority == priority
+        else:
+            # Invalid priority should raise error
+            with pytest.raises(ValueError):
+                Activity(name="Test", type=ActivityType.OUTDOOR, priority=priority)
+
+    def test_activity_is_frozen(self, sample_activity):
+        """Test activities can't be changed after they are built"""
         with pytest.raises(ValueError):
-            Activity(name="Test", type=ActivityType.OUTDOOR, priority=6)
+            sample_activity.priority = 1
 
     def test_day_plan_creation(self):
         """Test DayPlan model creation"""
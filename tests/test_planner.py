@@ -1,9 +1,27 @@
 import pytest
 import asyncio
-from app.planner.day_planner import DayPlanner
+from app.planner.day_planner import DayPlanner, wait_for_pending_saves
 from app.db.models import UserPreferences, ActivityType
 from app.weather.weather_station import WeatherCondition
 
+# Weather pushed to the planner for each condition, built once at import
+_WEATHER_CASES = tuple(
+    {
+        "condition": condition,
+        "temperature": 20,
+        "humidity": 50,
+        "description": f"{condition.value.lower()} weather",
+        "location": "Berlin"
+    }
+    for condition in (WeatherCondition.SUNNY, WeatherCondition.RAINY, WeatherCondition.CLOUDY, WeatherCondition.SNOWY)
+)
+
+def _assert_plan_ok(planner):
+    """Assert the planner holds a plan with at least one activity"""
+    plan = planner.current_plan
+    assert plan is not None
+    assert len(plan.activities) > 0
+
 class TestDayPlanner:
     @pytest.mark.asyncio
     async def test_day_planner_initialization(self):
@@ -26,9 +44,8 @@ class TestDayPlanner:
         }
         
         await planner.update(weather_data)
-        assert planner.current_plan is not None
+        _assert_plan_ok(planner)
         assert planner.current_plan.location == "Berlin"
-        assert len(planner.current_plan.activities) > 0
 
     @pytest.mark.asyncio
     async def test_planner_preferences_update(self):
@@ -42,31 +59,178 @@ class TestDayPlanner:
             weekend_mode=False
         )
         
-        await planner.set_user_preferences(new_prefs)
+        planner.set_user_preferences(new_prefs)
         assert planner.user_preferences.preferred_types == [ActivityType.INDOOR]
         assert planner.user_preferences.avoid_types == [ActivityType.OUTDOOR]
 
     @pytest.mark.asyncio
-    async def test_planner_different_weather_conditions(self):
+    @pytest.mark.parametrize("weather_data", _WEATHER_CASES, ids=lambda case: case["condition"].value)
+    async def test_planner_different_weather_conditions(self, weather_data):
         """Test planner with different weather conditions"""
         planner = DayPlanner()
         
-        weather_conditions = [
-            (WeatherCondition.SUNNY, "Sunny"),
-            (WeatherCondition.RAINY, "Rainy"),
-            (WeatherCondition.CLOUDY, "Cloudy"),
-            (WeatherCondition.SNOWY, "Snowy")
-        ]
-        
-        for condition, condition_name in weather_conditions:
-            weather_data = {
-                "condition": condition,
-                "temperature": 20,
-                "humidity": 50,
-                "description": f"{condition_name.lower()} weather",
-                "location": "Berlin"
-            }
-            
-            await planner.update(weather_data)
-            assert planner.current_plan is not None
-            assert len(planner.current_plan.activities) > 0
\ No newline at end of file
+        await planner.update(weather_data)
+        _assert_plan_ok(planner)
+
+    @pytest.mark.asyncio
+    async def test_planner_user_plans(self, db):
+        """Test recent plans are read back as DayPlan objects"""
+        planner = DayPlanner(user_id="history_user")
+        
+        weather_data = {
+            "condition": WeatherCondition.RAINY,
+            "temperature": 12,
+            "humidity": 80,
+            "description": "light rain",
+            "location": "Berlin"
+        }
+        
+        await planner.update(weather_data)
+        await wait_for_pending_saves()
+        plans = await planner.get_user_plans()
+        assert len(plans) == 1
+        assert plans[0].user_id == planner.user_id
+        assert plans[0].activities[0].name == planner.current_plan.activities[0].name
+
+    @pytest.mark.asyncio
+    async def test_planner_plan_cache(self, db):
+        """Test saved plans are served from the in-process cache"""
+        planner = DayPlanner(user_id="cache_user")
+        
+        weather_data = {
+            "condition": WeatherCondition.CLOUDY,
+            "temperature": 15,
+            "humidity": 70,
+            "description": "overcast",
+            "location": "Berlin"
+        }
+        
+        await planner.update(weather_data)
+        await wait_for_pending_saves()
+        plan = planner.current_plan
+        assert await planner.get_plan_from_db(plan.date, "Berlin") is plan
+        
+        planner._plan_cache.clear()
+        stored = await planner.get_plan_from_db(plan.date, "Berlin")
+        assert stored is not plan
+        assert stored.activities[0].name == plan.activities[0].name
+
+    @pytest.mark.asyncio
+    async def test_planner_reads_back_unknown_condition(self, db):
+        """Test plans stored for an unknown condition are still read back, along with the others"""
+        planner = DayPlanner(user_id="foggy_user")
+        
+        await planner.update({"condition": "Foggy", "temperature": 8, "location": "London"})
+        await planner.update({"condition": WeatherCondition.SUNNY, "temperature": 24, "location": "Madrid"})
+        await wait_for_pending_saves()
+        planner._plan_cache.clear()
+        
+        stored = await planner.get_plan_from_db(planner.current_plan.date, "London")
+        assert stored is not None
+        assert stored.weather["condition"] == "Foggy"
+        
+        plans = await planner.get_user_plans()
+        assert {plan.location for plan in plans} == {"London", "Madrid"}
+
+    @pytest.mark.asyncio
+    async def test_planner_force_regeneration_with_weather(self):
+        """Test forced regeneration reuses weather data it is given"""
+        planner = DayPlanner()
+        
+        weather_data = {
+            "condition": WeatherCondition.SNOWY,
+            "temperature": -3,
+            "humidity": 85,
+            "description": "light snow",
+            "location": "Oslo"
+        }
+        
+        await planner.force_plan_regeneration("Oslo", weather_data)
+        assert planner.current_plan.location == "Oslo"
+        assert planner.current_plan.weather["description"] == "light snow"
+
+    @pytest.mark.asyncio
+    async def test_planner_summary_cache(self):
+        """Test the plan summary is reused until preferences change"""
+        planner = DayPlanner()
+        
+        await planner.update({"condition": WeatherCondition.SUNNY, "temperature": 22, "location": "Berlin"})
+        summary = planner.get_plan_summary()
+        assert planner.get_plan_summary() is summary
+        
+        planner.set_user_preferences(UserPreferences(preferred_types=[ActivityType.INDOOR]))
+        updated = planner.get_plan_summary()
+        assert updated is not summary
+        assert updated["user_preferences"]["preferred_types"] == [ActivityType.INDOOR]
+
+    @pytest.mark.asyncio
+    async def test_planner_saves_are_batched(self, db, monkeypatch):
+        """Test concurrent plan saves are written with one bulk upsert"""
+        from app.planner import day_planner as day_planner_module
+        
+        # Let saves left over from earlier tests finish first
+        await wait_for_pending_saves()
+        calls = []
+        
+        async def fake_bulk_replace(collection, replacements):
+            calls.append(replacements)
+        
+        monkeypatch.setattr(day_planner_module, "bulk_replace", fake_bulk_replace)
+        
+        planners = [DayPlanner(user_id=f"batch_{i}") for i in range(3)]
+        weather_data = {"condition": WeatherCondition.SUNNY, "temperature": 24, "location": "Berlin"}
+        await asyncio.gather(*(planner.update(weather_data) for planner in planners))
+        await wait_for_pending_saves()
+        
+        assert len(calls) == 1
+        assert {query["user_id"] for query, _ in calls[0]} == {planner.user_id for planner in planners}
+
+    @pytest.mark.asyncio
+    async def test_plan_to_doc_matches_model_dump(self):
+        """Test the hand-built plan document matches pydantic's serialization"""
+        from app.planner.day_planner import _plan_to_doc
+        
+        planner = DayPlanner()
+        await planner.update({"condition": WeatherCondition.RAINY, "temperature": 9, "location": "Berlin"})
+        
+        plan = planner.current_plan
+        assert _plan_to_doc(plan) == plan.model_dump(mode="json")
+
+    @pytest.mark.asyncio
+    async def test_plan_from_doc_restores_enums(self):
+        """Test plans read back from a stored document have enum members, not plain strings"""
+        from app.planner.day_planner import _plan_from_doc, _plan_to_doc
+        
+        planner = DayPlanner()
+        await planner.update({"condition": WeatherCondition.SNOWY, "temperature": -2, "location": "Oslo"})
+        
+        # Stored documents hold plain strings, as model_dump(mode="json") produces
+        plan = _plan_from_doc(planner.current_plan.model_dump(mode="json"))
+        assert plan.weather["condition"] is WeatherCondition.SNOWY
+        assert all(isinstance(activity.type, ActivityType) for activity in plan.activities)
+        assert _plan_to_doc(plan) == _plan_to_doc(planner.current_plan)
+
+    @pytest.mark.asyncio
+    async def test_planner_skips_repeated_weather(self):
+        """Test the same weather pushed twice keeps the current plan unless forced"""
+        planner = DayPlanner()
+        weather_data = {"condition": WeatherCondition.CLOUDY, "temperature": 14.2, "location": "Berlin"}
+        
+        await planner.update(weather_data)
+        plan = planner.current_plan
+        await planner.update({**weather_data, "temperature": 13.9})
+        assert planner.current_plan is plan
+        
+        await planner.force_plan_regeneration("Berlin", weather_data)
+        assert planner.current_plan is not plan
+
+    @pytest.mark.asyncio
+    async def test_planner_accepts_condition_strings(self):
+        """Test plain condition strings pick the same strategy as enum members"""
+        planner = DayPlanner()
+        
+        await planner.update({"condition": "Snowy", "temperature": -5, "location": "Oslo"})
+        assert type(planner._strategy).__name__ == "SnowyWeatherStrategy"
+        
+        await planner.update({"condition": "Foggy", "temperature": 5, "location": "Oslo"})
+        assert type(planner._strategy).__name__ == "CloudyWeatherStrategy"
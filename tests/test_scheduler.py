@@ -0,0 +1,181 @@
+import pytest
+import asyncio
+from app.tasks.scheduler import CustomScheduler
+
+class TestScheduler:
+    @pytest.mark.asyncio
+    async def test_jobs_run_when_due(self):
+        """Test jobs run on their interval instead of on a fixed polling tick"""
+        scheduler = CustomScheduler()
+        runs = []
+        
+        async def job():
+            runs.append(job)
+        
+        scheduler.add_job(job, seconds=0.05, id="fast")
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        scheduler.shutdown()
+        
+        assert len(runs) >= 4
+
+    @pytest.mark.asyncio
+    async def test_shutdown_wakes_scheduler(self):
+        """Test shutdown stops a scheduler that is waiting for a far-off job"""
+        scheduler = CustomScheduler()
+        
+        async def job():
+            pass
+        
+        scheduler.add_job(job, seconds=3600, id="hourly")
+        scheduler.start()
+        await asyncio.sleep(0)
+        
+        scheduler.shutdown()
+        await asyncio.sleep(0.01)
+        assert scheduler._background_task.done()
+
+    @pytest.mark.asyncio
+    async def test_slow_job_does_not_block_others(self):
+        """Test a long-running job doesn't delay other due jobs"""
+        scheduler = CustomScheduler()
+        fast_runs = []
+        
+        async def slow_job():
+            await asyncio.sleep(1)
+        
+        async def fast_job():
+            fast_runs.append(fast_job)
+        
+        scheduler.add_job(slow_job, seconds=0.01, id="slow")
+        scheduler.add_job(fast_job, seconds=0.05, id="fast")
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        scheduler.shutdown()
+        
+        assert len(fast_runs) >= 4
+
+    @pytest.mark.asyncio
+    async def test_overrunning_job_is_not_restarted(self):
+        """Test a job still running when it comes due again isn't started a second time"""
+        scheduler = CustomScheduler()
+        running = []
+        overlaps = []
+        
+        async def slow_job():
+            if running:
+                overlaps.append(slow_job)
+            running.append(slow_job)
+            try:
+                await asyncio.sleep(0.2)
+            finally:
+                running.pop()
+        
+        scheduler.add_job(slow_job, seconds=0.02, id="slow")
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        scheduler.shutdown()
+        
+        assert overlaps == []
+        assert len(scheduler._inflight) <= 1
+
+    @pytest.mark.asyncio
+    async def test_disable_and_enable_job(self):
+        """Test disabled jobs are skipped until they are enabled again"""
+        scheduler = CustomScheduler()
+        runs = []
+        
+        async def job():
+            runs.append(job)
+        
+        scheduler.add_job(job, seconds=0.02, id="toggled")
+        scheduler.disable_job("toggled")
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        assert runs == []
+        
+        scheduler.enable_job("toggled")
+        await asyncio.sleep(0.1)
+        scheduler.shutdown()
+        assert len(runs) >= 2
+
+    @pytest.mark.asyncio
+    async def test_health_check_is_cached(self, monkeypatch):
+        """Test concurrent health checks share one probe and reuse its result"""
+        from app.tasks import scheduler as scheduler_module
+        
+        probes = []
+        
+        def fake_probe():
+            probes.append(fake_probe)
+            return 10.0, 1024
+        
+        monkeypatch.setattr(scheduler_module, "_collect_disk_and_mem", fake_probe)
+        monkeypatch.setitem(scheduler_module._HEALTH_CACHE, "ts", float("-inf"))
+        
+        results = await asyncio.gather(*(scheduler_module.health_check() for _ in range(5)))
+        assert len(probes) == 1
+        assert all(result is results[0] for result in results)
+        assert await scheduler_module.health_check() is results[0]
+
+    @pytest.mark.asyncio
+    async def test_health_check_right_after_boot(self, monkeypatch):
+        """Test the empty health cache isn't served while the monotonic clock is still small"""
+        from app.tasks import scheduler as scheduler_module
+        
+        monkeypatch.setattr(scheduler_module, "_collect_disk_and_mem", lambda: (10.0, 1024))
+        monkeypatch.setattr(scheduler_module, "_time", lambda: 1.0)
+        monkeypatch.setitem(scheduler_module._HEALTH_CACHE, "ts", float("-inf"))
+        monkeypatch.setitem(scheduler_module._HEALTH_CACHE, "value", None)
+        
+        result = await scheduler_module.health_check()
+        assert result is not None
+        assert result["status"] == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_sync_jobs_run_in_executor(self):
+        """Test plain functions are run as jobs alongside coroutines"""
+        scheduler = CustomScheduler()
+        runs = []
+        
+        def job():
+            runs.append(job)
+        
+        scheduler.add_job(job, seconds=0.02, id="sync")
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        scheduler.shutdown()
+        
+        assert len(runs) >= 2
+
+    def test_format_uptime(self):
+        """Test uptimes are formatted as hours, minutes and seconds"""
+        from app.tasks.scheduler import format_uptime
+        
+        assert format_uptime(0) == "0h 0m 0s"
+        assert format_uptime(3723.9) == "1h 2m 3s"
+        assert format_uptime(90061) == "25h 1m 1s"
+
+    @pytest.mark.asyncio
+    async def test_add_jobs_registers_all(self):
+        """Test bulk-registered jobs are scheduled like individually added ones"""
+        scheduler = CustomScheduler()
+        runs = []
+        
+        async def fast():
+            runs.append("fast")
+        
+        async def slow():
+            runs.append("slow")
+        
+        scheduler.add_job(slow, seconds=3600, id="slow")
+        scheduler.add_jobs([
+            {"func": fast, "seconds": 0.02, "id": "fast"},
+            {"func": slow, "seconds": 3600, "id": "slow"}
+        ])
+        assert set(scheduler.jobs) == {"fast", "slow"}
+        
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        scheduler.shutdown()
+        assert runs and set(runs) == {"fast"}
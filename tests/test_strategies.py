@@ -1,45 +1,77 @@
 import pytest
 import asyncio
+from itertools import islice
 from app.db.models import UserPreferences, ActivityType
+from app.planner.strategies.sunny import SunnyWeatherStrategy
+from app.planner.strategies.rainy import RainyWeatherStrategy
+
+# Strategies only read preferences, so one default instance is shared
+_EMPTY_PREFS = UserPreferences()
+
+def _filter_activities(activities, preferences):
+    """Reference selection: the first 4 activities of allowed types, in catalog order"""
+    avoid = frozenset(preferences.avoid_types)
+    preferred = frozenset(preferences.preferred_types)
+    filtered = (
+        activity for activity in activities
+        if activity.type not in avoid and (not preferred or activity.type in preferred)
+    )
+    return list(islice(filtered, 4))
 
 class TestStrategies:
     @pytest.mark.asyncio
     async def test_sunny_strategy(self, sample_user_preferences):
         """Test SunnyWeatherStrategy"""
-        from app.planner.strategies.sunny import SunnyWeatherStrategy
         strategy = SunnyWeatherStrategy()
         activities = await strategy.get_activities(sample_user_preferences)
         
         assert len(activities) > 0
-        assert all(isinstance(activity.name, str) for activity in activities)
-        assert all(activity.priority >= 1 for activity in activities)
-        # Should not contain avoided types
-        assert all(activity.type != ActivityType.SPORT for activity in activities)
+        for activity in activities:
+            assert isinstance(activity.name, str)
+            assert activity.priority >= 1
+            # Should not contain avoided types
+            assert activity.type is not ActivityType.SPORT
 
     @pytest.mark.asyncio
     async def test_rainy_strategy(self, sample_user_preferences):
         """Test RainyWeatherStrategy"""
-        from app.planner.strategies.rainy import RainyWeatherStrategy
         strategy = RainyWeatherStrategy()
         activities = await strategy.get_activities(sample_user_preferences)
         
         assert len(activities) > 0
         # Rainy strategy should prefer indoor activities
-        indoor_activities = [a for a in activities if a.type in [ActivityType.INDOOR, ActivityType.LEARNING]]
-        assert len(indoor_activities) > 0
+        assert any(a.type is ActivityType.INDOOR or a.type is ActivityType.LEARNING for a in activities)
 
     @pytest.mark.asyncio
-    async def test_all_strategies_return_activities(self, all_strategies, sample_user_preferences):
+    async def test_all_strategies_return_activities(self, strategy, sample_user_preferences):
         """Test that all strategies return activities"""
-        for strategy in all_strategies:
-            activities = await strategy.get_activities(sample_user_preferences)
-            assert len(activities) > 0
-            assert len(activities) <= 4  # Max 4 activities per strategy
+        activities = await strategy.get_activities(sample_user_preferences)
+        assert len(activities) > 0
+        assert len(activities) <= 4  # Max 4 activities per strategy
 
     @pytest.mark.asyncio
-    async def test_strategy_with_empty_preferences(self, all_strategies):
+    async def test_strategy_with_empty_preferences(self, strategy):
         """Test strategies with empty preferences"""
-        empty_prefs = UserPreferences()
-        for strategy in all_strategies:
-            activities = await strategy.get_activities(empty_prefs)
-            assert len(activities) > 0
\ No newline at end of file
+        activities = await strategy.get_activities(_EMPTY_PREFS)
+        assert len(activities) > 0
+
+    @pytest.mark.asyncio
+    async def test_strategy_keeps_highest_priority(self, strategy):
+        """Test strategies return their highest priority activities first"""
+        activities = await strategy.get_activities(_EMPTY_PREFS)
+        priorities = [activity.priority for activity in activities]
+        assert priorities == sorted(priorities, reverse=True)
+        assert priorities[0] == max(a.priority for a in strategy._ACTIVITIES)
+
+    @pytest.mark.asyncio
+    async def test_strategy_type_index_matches_filter(self, strategy):
+        """Test the per-type index picks the same activities as a full filter"""
+        preference_sets = [
+            _EMPTY_PREFS,
+            UserPreferences(avoid_types=[ActivityType.OUTDOOR]),
+            UserPreferences(preferred_types=[ActivityType.INDOOR, ActivityType.RELAXATION]),
+            UserPreferences(preferred_types=[ActivityType.SPORT], avoid_types=[ActivityType.SPORT])
+        ]
+        for prefs in preference_sets:
+            expected = _filter_activities(strategy._ACTIVITIES, prefs)
+            assert await strategy.get_activities(prefs) == expected
@@ -1,13 +1,12 @@
 import pytest
 import asyncio
 from app.weather.weather_api import WeatherAPI
-from app.weather.weather_station import WeatherStation, WeatherCondition
+from app.weather.weather_station import WeatherCondition
 
 class TestWeather:
     @pytest.mark.asyncio
-    async def test_weather_api_mock_data(self):
+    async def test_weather_api_mock_data(self, weather_api):
         """Test WeatherAPI with mock data"""
-        weather_api = WeatherAPI()
         weather_data = await weather_api.get_weather_data("Berlin")
         
         assert weather_data is not None
@@ -16,29 +15,50 @@ class TestWeather:
         assert "name" in weather_data
         assert weather_data["name"] == "Berlin"
 
-    def test_weather_condition_mapping(self):
-        """Test weather condition mapping"""
+    @pytest.mark.asyncio
+    async def test_weather_api_cache(self):
+        """Test WeatherAPI reuses fresh cached data per city"""
+        weather_api = WeatherAPI()
+        first, first_condition = await weather_api.get_cached_weather("Berlin")
+        second, second_condition = await weather_api.get_cached_weather("Berlin")
+        
+        assert second is first
+        assert second_condition == first_condition
+        
+        # Expired entries are refetched
+        weather_api.cache_ttl = 0
+        third, _ = await weather_api.get_cached_weather("Berlin")
+        assert third is not first
+
+    @pytest.mark.asyncio
+    async def test_weather_api_concurrent_fetch(self):
+        """Test concurrent misses for a city share one fetch and don't leave its lock behind"""
         weather_api = WeatherAPI()
+        results = await asyncio.gather(*(weather_api.get_cached_weather("Paris") for _ in range(5)))
         
-        # Test different weather conditions
-        test_cases = [
-            (800, WeatherCondition.SUNNY),
-            (500, WeatherCondition.RAINY),
-            (600, WeatherCondition.SNOWY),
-            (801, WeatherCondition.CLOUDY),
-            (300, WeatherCondition.RAINY),
-            (701, WeatherCondition.CLOUDY)
-        ]
-        
-        for weather_id, expected_condition in test_cases:
-            mock_data = {"weather": [{"id": weather_id}]}
-            condition = weather_api.map_weather_condition(mock_data)
-            assert condition == expected_condition
+        assert all(result[0] is results[0][0] for result in results)
+        assert weather_api._locks == {}
+
+    @pytest.mark.parametrize("weather_id, expected_condition", [
+        (800, WeatherCondition.SUNNY),
+        (500, WeatherCondition.RAINY),
+        (600, WeatherCondition.SNOWY),
+        (801, WeatherCondition.CLOUDY),
+        (300, WeatherCondition.RAINY),
+        (701, WeatherCondition.CLOUDY)
+    ])
+    def test_weather_condition_mapping(self, weather_api, weather_id, expected_condition):
+        """Test weather condition mapping"""
+        mock_data = {"weather": [{"id": weather_id}]}
+        assert weather_api.map_weather_condition(mock_data) == expected_condition
 
     @pytest.mark.asyncio
-    async def test_weather_station(self):
+    async def test_weather_station(self, weather_station):
         """Test WeatherStation observer pattern"""
-        station = WeatherStation()
+        station = weather_station
+        
+        observer_count = 8
+        all_notified = asyncio.Event()
         
         class MockObserver:
             def __init__(self):
@@ -46,9 +66,14 @@ class TestWeather:
             
             async def update(self, weather_data):
                 self.updates.append(weather_data)
+                # Only finishes once every observer has been called, i.e. they run concurrently
+                if sum(len(o.updates) for o in observers) == observer_count:
+                    all_notified.set()
+                await all_notified.wait()
         
-        observer = MockObserver()
-        station.attach(observer)
+        observers = [MockObserver() for _ in range(observer_count)]
+        for observer in observers:
+            station.attach(observer)
         
         test_weather = {
             "condition": WeatherCondition.SUNNY,
@@ -56,6 +81,29 @@ class TestWeather:
             "description": "clear sky"
         }
         
-        await station.set_weather(test_weather, "Berlin")
+        await asyncio.wait_for(station.set_weather(test_weather, "Berlin"), timeout=1)
+        for observer in observers:
+            assert observer.updates == [test_weather]
+
+    @pytest.mark.asyncio
+    async def test_weather_station_failing_observer(self, weather_station):
+        """Test one failing observer does not stop the others from being notified"""
+        station = weather_station
+        
+        class FailingObserver:
+            async def update(self, weather_data):
+                raise RuntimeError("observer failed")
+        
+        class MockObserver:
+            def __init__(self):
+                self.updates = []
+            
+            async def update(self, weather_data):
+                self.updates.append(weather_data)
+        
+        observer = MockObserver()
+        station.attach(FailingObserver())
+        station.attach(observer)
+        
+        await station.set_weather({"condition": WeatherCondition.RAINY, "temperature": 12}, "Berlin")
         assert len(observer.updates) == 1
-        assert observer.updates[0] == test_weather
\ No newline at end of file